@@ -7,26 +7,180 @@ import numpy as np
 import pydicom
 import os
 
+from ai_model.model_training import LiverSegmentationModel
+
 class ROIPredictor:
+    # Input size used to warm up the compiled model
+    WARMUP_SHAPE = (1, 1, 512, 512)
+    
+    # Connected components smaller than this (in pixels) are treated as noise
+    MIN_COMPONENT_AREA = 20
+    
     def __init__(self, model_path):
-        # Load trained model
-        self.model = torch.load(model_path)
+        self.device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
+        
+        # Run the forward pass in reduced precision on GPU (tensor cores),
+        # preferring bfloat16 where supported since it doesn't overflow
+        self.use_amp = self.device.type == 'cuda'
+        if self.use_amp and torch.cuda.is_bf16_supported():
+            self.amp_dtype = torch.bfloat16
+        else:
+            self.amp_dtype = torch.float16
+        
+        # Load trained weights into a freshly built model; weights_only avoids
+        # unpickling arbitrary objects and lets the model be scripted below
+        state_dict = torch.load(model_path, map_location='cpu', weights_only=True)
+        self.model = LiverSegmentationModel()
+        self.model.load_state_dict(state_dict)
+        self.model.to(self.device, memory_format=torch.channels_last)
         self.model.eval()
         
+        # Compile the model so inference doesn't pay Python dispatch per op
+        example = torch.zeros(self.WARMUP_SHAPE, device=self.device)
+        example = example.contiguous(memory_format=torch.channels_last)
+        try:
+            self.model = torch.jit.script(self.model)
+        except Exception:
+            # Fall back to tracing for models that aren't scriptable
+            self.model = torch.jit.trace(self.model, example)
+        
+        self.warmup(example)
+        
+    def warmup(self, example):
+        # The first calls to a scripted model trigger profiling and
+        # optimization, run them now rather than on the first user click
+        with torch.no_grad(), self.autocast():
+            for _ in range(2):
+                self.model(example)
+    
+    def autocast(self):
+        # Mixed-precision context for the forward pass (no-op on CPU)
+        return torch.autocast(device_type=self.device.type, dtype=self.amp_dtype,
+                              enabled=self.use_amp)
+        
     def preprocess_image(self, dicom_data):
-        # Convert DICOM to tensor
-        # Apply same preprocessing as during training
-        pass
+        # Series headers are loaded without pixel data; read it from the file
+        if 'PixelData' not in dicom_data:
+            dicom_data = pydicom.dcmread(dicom_data.filename)
+        
+        # Convert DICOM to float32 array of stored values
+        image = dicom_data.pixel_array.astype(np.float32)
+        
+        # Apply rescale slope/intercept in place
+        slope = float(getattr(dicom_data, 'RescaleSlope', 1.0))
+        intercept = float(getattr(dicom_data, 'RescaleIntercept', 0.0))
+        if slope != 1.0:
+            image *= slope
+        if intercept != 0.0:
+            image += intercept
+        
+        # Return as a (1, H, W) CPU tensor (shares memory with the array)
+        return torch.from_numpy(image).unsqueeze(0)
         
     def predict(self, dicom_data):
-        # Preprocess input
-        # Run inference
-        # Post-process results (convert to ROIs)
-        pass
+        # Single slice is just a batch of one
+        return self.predict_batch([dicom_data])[0]
+    
+    def predict_batch(self, dicom_list):
+        # Preprocess every slice into a single (N, 1, H, W) batch. On GPU the
+        # batch lives in pinned host memory so the copy below is asynchronous
+        first = self.preprocess_image(dicom_list[0])
+        batch = torch.empty((len(dicom_list),) + tuple(first.shape),
+                            dtype=first.dtype, pin_memory=self.device.type == 'cuda')
+        batch[0] = first
+        for i, dicom_data in enumerate(dicom_list[1:], start=1):
+            batch[i] = self.preprocess_image(dicom_data)
+        batch = batch.to(self.device, non_blocking=True)
+        
+        # Conv layers fall back to slow kernels on non-contiguous input
+        batch = batch.contiguous(memory_format=torch.channels_last)
+        
+        # Run inference once for the whole batch
+        with torch.no_grad(), self.autocast():
+            segmentation = self.model(batch)
+        
+        # Post-processing (softmax/argmax) is done in full precision
+        segmentation = segmentation.float()
+        
+        # Post-process results (convert to ROIs), one list per slice
+        return [self.extract_rois_from_segmentation(mask) for mask in segmentation]
         
     def extract_rois_from_segmentation(self, segmentation_mask):
-        # Convert segmentation mask to discrete ROIs
-        # For each segment, find connected components
-        # Fit circles/contours to each component
-        # Return ROIs in the format used by your application
-        pass
\ No newline at end of file
+        # Convert (C, H, W) segmentation logits to discrete ROIs, staying on
+        # the model's device until the final list is built
+        labels = segmentation_mask.argmax(dim=0)
+        height, width = labels.shape
+        min_dim = min(height, width)
+        
+        rois = []  # One (k, 4) tensor per segment
+        for segment in range(1, segmentation_mask.shape[0]):  # 0 is background
+            mask = labels == segment
+            if not mask.any():
+                continue
+            
+            # For each segment, find connected components
+            components = self.connected_components(mask)
+            ys, xs = torch.nonzero(mask, as_tuple=True)
+            _, component_idx, areas = torch.unique(components[ys, xs], return_inverse=True,
+                                                   return_counts=True)
+            
+            # Fit a circle to each component: centroid plus equal-area radius
+            sum_x = torch.zeros(len(areas), device=mask.device).index_add_(0, component_idx, xs.float())
+            sum_y = torch.zeros(len(areas), device=mask.device).index_add_(0, component_idx, ys.float())
+            areas = areas.float()
+            keep = areas >= self.MIN_COMPONENT_AREA
+            center_x = (sum_x[keep] / areas[keep]) / width
+            center_y = (sum_y[keep] / areas[keep]) / height
+            radius = torch.sqrt(areas[keep] / np.pi) / min_dim
+            
+            segment_col = torch.full_like(radius, segment)
+            rois.append(torch.stack((segment_col, center_x, center_y, radius), dim=1))
+        
+        # Return ROIs as a (K, 4) tensor of (segment, center_x, center_y, radius)
+        # in normalized units
+        if not rois:
+            return segmentation_mask.new_zeros((0, 4))
+        return torch.cat(rois)
+    
+    def connected_components(self, mask):
+        # Label the 8-connected components of a (H, W) bool mask with union-find
+        # in parallel: each round hooks the larger of two linked roots onto the
+        # smaller (a scatter-min), then pointer jumping flattens every tree. Each
+        # round at least halves the number of trees per component, so it takes
+        # O(log N) rounds regardless of component shape or diameter. Labels are
+        # int64 pixel indices + 1 (0 is background), exact at any image size
+        height, width = mask.shape
+        index = torch.arange(height * width, device=mask.device, dtype=torch.int64)
+        
+        # Foreground pixel pairs (p, q) with q one step right, down, or diagonally below p
+        index_2d = index.view(height, width)
+        sources, targets = [], []
+        for dy, dx in ((0, 1), (1, 0), (1, 1), (1, -1)):
+            p_cols = slice(max(0, -dx), width - max(0, dx))
+            q_cols = slice(max(0, dx), width - max(0, -dx))
+            linked = mask[:height - dy, p_cols] & mask[dy:, q_cols]
+            sources.append(index_2d[:height - dy, p_cols][linked])
+            targets.append(index_2d[dy:, q_cols][linked])
+        sources, targets = torch.cat(sources), torch.cat(targets)
+        
+        parent = index.clone()
+        while True:
+            root_source, root_target = parent[sources], parent[targets]
+            crossing = root_source != root_target
+            if not crossing.any():
+                break
+            
+            # Edges inside a single tree stay that way, so later rounds skip them
+            sources, targets = sources[crossing], targets[crossing]
+            root_source, root_target = root_source[crossing], root_target[crossing]
+            parent.scatter_reduce_(0, torch.maximum(root_source, root_target),
+                                   torch.minimum(root_source, root_target), reduce='amin')
+            
+            # Pointer jumping: halves every path per step until each pixel points at its root
+            while True:
+                grandparent = parent[parent]
+                if torch.equal(grandparent, parent):
+                    break
+                parent = grandparent
+        
+        return (parent + 1).view(height, width) * mask
\ No newline at end of file
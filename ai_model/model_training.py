@@ -46,12 +46,13 @@ class LiverSegmentationModel(nn.Module):
 def train_model(model, train_loader, val_loader, epochs=100, lr=0.001):
     # Set up optimizer, loss function, training loop
     # Validate model on validation set
-    # Save best model
+    # Save best model weights (torch.save(model.state_dict(), path)),
+    # which is what ROIPredictor loads
     pass
 
 if __name__ == "__main__":
     # Load and preprocess data
     # Create train/validation splits
     # Initialize and train model
-    # Save trained model
+    # Save trained model weights (state_dict)
     pass
\ No newline at end of file
@@ -2,6 +2,8 @@
 """
 Manager class to integrate AI model with the Liver MRI Viewer
 """
+import torch
+
 from ai_model.model_inference import ROIPredictor
 
 class AIModelManager:
@@ -15,18 +17,30 @@ class AIModelManager:
         self.predictor = ROIPredictor(model_path)
         return self.predictor is not None
     
-    def predict_rois(self, dicom_series):
+    def predict_rois(self, dicom_series, batch_size=8, progress_callback=None):
         """Predict ROIs for a series of DICOM images"""
         if not self.predictor:
             return None
             
-        rois = []
-        for slice_idx, dicom_data in enumerate(dicom_series):
-            # Get prediction for this slice
-            slice_rois = self.predictor.predict(dicom_data)
+        slice_rois = []
+        for start in range(0, len(dicom_series), batch_size):
+            # Run the model on a chunk of slices at once
+            batch = dicom_series[start:start + batch_size]
+            batch_rois = self.predictor.predict_batch(batch)
+            
+            # Add slice index to ROIs as a leading column
+            for offset, rois in enumerate(batch_rois):
+                slice_idx = rois.new_full((len(rois), 1), start + offset)
+                slice_rois.append(torch.cat((slice_idx, rois), dim=1))
             
-            # Add slice index to ROIs
-            for roi in slice_rois:
-                rois.append((slice_idx,) + roi)
-                
-        return rois
\ No newline at end of file
+            if progress_callback is not None:
+                done = min(start + batch_size, len(dicom_series))
+                progress_callback(int(100 * done / len(dicom_series)))
+        
+        if not slice_rois:
+            return []
+        
+        # Single device-to-host copy for the whole series, then convert to tuples
+        table = torch.cat(slice_rois).cpu().tolist()
+        return [(int(slice_idx), int(segment), center_x, center_y, radius)
+                for slice_idx, segment, center_x, center_y, radius in table]
\ No newline at end of file
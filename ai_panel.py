@@ -2,9 +2,35 @@
 """
 UI panel for AI-related controls
 """
+import os
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QPushButton, QFileDialog,
                            QLabel, QProgressBar, QGroupBox, QComboBox)
-from PyQt5.QtCore import pyqtSignal, Qt
+from PyQt5.QtCore import pyqtSignal, pyqtSlot, Qt, QObject, QThread, QCoreApplication
+
+
+class InferenceWorker(QObject):
+    """Runs ROI prediction on a background thread so the UI stays responsive"""
+    
+    # Define signals
+    progress = pyqtSignal(int)  # percent complete
+    finished = pyqtSignal(list)  # predicted ROIs
+    error = pyqtSignal(str)  # why prediction failed
+    
+    def __init__(self, ai_model_manager):
+        super().__init__()
+        self.ai_model_manager = ai_model_manager
+    
+    @pyqtSlot(object)
+    def run(self, dicom_series):
+        """Predict ROIs for a series, reporting progress per batch"""
+        # An exception escaping a slot would abort the application, so report it instead
+        try:
+            rois = self.ai_model_manager.predict_rois(dicom_series, progress_callback=self.progress.emit)
+        except Exception as e:
+            self.error.emit(f"{type(e).__name__}: {e}")
+            return
+        self.finished.emit(rois or [])
+
 
 class AIControlPanel(QWidget):
     """UI panel for AI model controls"""
@@ -12,6 +38,7 @@ class AIControlPanel(QWidget):
     # Define signals
     model_loaded = pyqtSignal(str)  # model path
     predict_rois_requested = pyqtSignal()
+    run_inference = pyqtSignal(object)  # DICOM series, delivered to the worker thread
     
     def __init__(self, parent, dicom_model, roi_manager, ai_model_manager):
         super().__init__(parent)
@@ -39,16 +66,32 @@ class AIControlPanel(QWidget):
         self.predict_button.setEnabled(False)  # Disabled until model is loaded
         
         self.progress_bar = QProgressBar()
+        self.progress_bar.setRange(0, 100)
         self.progress_bar.setVisible(False)
         
+        self.status_label = QLabel("")
+        self.status_label.setWordWrap(True)
+        
         # Add widgets to layout
         self.model_layout.addWidget(self.load_model_button)
         self.model_layout.addWidget(self.model_label)
         self.model_layout.addWidget(self.predict_button)
         self.model_layout.addWidget(self.progress_bar)
+        self.model_layout.addWidget(self.status_label)
         
         self.model_group.setLayout(self.model_layout)
         self.layout.addWidget(self.model_group)
+        
+        # Inference runs on a worker thread that is created once and kept alive
+        self.inference_thread = QThread(self)
+        self.inference_worker = InferenceWorker(self.ai_model_manager)
+        self.inference_worker.moveToThread(self.inference_thread)
+        self.run_inference.connect(self.inference_worker.run)  # queued across threads
+        self.inference_worker.progress.connect(self.progress_bar.setValue)
+        self.inference_worker.finished.connect(self.on_prediction_finished)
+        self.inference_worker.error.connect(self.on_prediction_failed)
+        QCoreApplication.instance().aboutToQuit.connect(self.stop_inference_thread)
+        self.inference_thread.start()
     
     def on_load_model(self):
         """Handle load model button click"""
@@ -63,11 +106,34 @@ class AIControlPanel(QWidget):
     
     def on_predict_rois(self):
         """Handle predict ROIs button click"""
+        if not self.dicom_model.current_series:
+            return
+        
+        self.progress_bar.setValue(0)
         self.progress_bar.setVisible(True)
+        self.status_label.clear()
         self.predict_button.setEnabled(False)
         self.predict_rois_requested.emit()
+        
+        # Hand the series to the worker thread; results arrive via on_prediction_finished
+        self.run_inference.emit(self.dicom_model.current_series)
+    
+    def on_prediction_finished(self, rois):
+        """Handle results from the inference worker"""
+        self.prediction_complete()
+        self.status_label.setText(f"Predicted {len(rois)} ROIs")
+    
+    def on_prediction_failed(self, message):
+        """Handle an error reported by the inference worker"""
+        self.prediction_complete()
+        self.status_label.setText(f"Prediction failed: {message}")
     
     def prediction_complete(self):
         """Handle prediction completion"""
         self.progress_bar.setVisible(False)
-        self.predict_button.setEnabled(True)
\ No newline at end of file
+        self.predict_button.setEnabled(True)
+    
+    def stop_inference_thread(self):
+        """Stop the inference worker thread"""
+        self.inference_thread.quit()
+        self.inference_thread.wait()
\ No newline at end of file
@@ -1,7 +1,8 @@
+from functools import partial
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QGridLayout,
                             QGroupBox, QLabel, QSlider, QSpinBox, QRadioButton,
-                            QButtonGroup, QPushButton)
-from PyQt5.QtCore import Qt, pyqtSignal
+                            QButtonGroup, QPushButton, QShortcut)
+from PyQt5.QtCore import Qt, pyqtSignal, QTimer
 from PyQt5.QtGui import QKeySequence
 
 class ControlPanel(QWidget):
@@ -16,11 +17,24 @@ class ControlPanel(QWidget):
     import_rois_requested = pyqtSignal()
     show_stats_requested = pyqtSignal()
     
+    # Segment button labels for each segmentation scheme
+    SEGMENT_LABELS = {
+        9: ["1", "2", "3", "4a", "4b", "5", "6", "7", "8"],
+        4: ["Left Lateral", "Left Medial", "Right Anterior", "Right Posterior"],
+    }
+    
     def __init__(self, parent, dicom_model, roi_manager, renderer):
         super().__init__(parent)
         self.dicom_model = dicom_model
         self.roi_manager = roi_manager
         self.renderer = renderer
+        
+        # Coalesce rapid slider moves into at most one window/level update per frame
+        self._pending_window_level = None
+        self._wl_timer = QTimer(self)
+        self._wl_timer.setSingleShot(True)
+        self._wl_timer.setInterval(16)
+        self._wl_timer.timeout.connect(self._emit_pending_window_level)
     
     def setup_ui(self):
         """Set up UI components for controls"""
@@ -85,33 +99,34 @@ class ControlPanel(QWidget):
         
         # Segment selection
         self.segment_group = QGroupBox("Liver Segment")
-        self.segment_layout = QGridLayout()
-        
-        # Create segment buttons for 9-segment scheme
-        self.segment_buttons = {}
-        segments_9 = [1, 2, 3, 4, 5, 6, 7, 8, 9]
-        segment_labels = ["1", "2", "3", "4a", "4b", "5", "6", "7", "8"]
-        self.roi_manager.segment_labels = segment_labels
-        row, col = 0, 0
-        for segment in segments_9:
-            btn = QPushButton(f"Segment {segment_labels[segment-1]}")
-            btn.setCheckable(True)
-            btn.clicked.connect(lambda checked, s=segment: self.on_segment_selected(s))
-            
-            if segment < 10:
-                # Create shortcut using the number key (1-9)
-                btn.setShortcut(QKeySequence(f"Ctrl+{segment}"))
-
-            self.segment_buttons[segment] = btn
-            self.segment_layout.addWidget(btn, row, col)
-            col += 1
-            if col > 2:  # 3 columns layout
-                col = 0
-                row += 1
+        self.segment_layout = QVBoxLayout()
+        
+        # Create the segment buttons for both schemes once; switching schemes
+        # only changes which set is visible
+        self.segment_pages = {}
+        self.scheme_segment_buttons = {}
+        for scheme in (9, 4):
+            page, buttons = self._create_segment_buttons(scheme)
+            self.segment_pages[scheme] = page
+            self.scheme_segment_buttons[scheme] = buttons
+            self.segment_layout.addWidget(page)
+        
+        # Start with the 9-segment scheme
+        self.segment_pages[4].setVisible(False)
+        self.segment_buttons = self.scheme_segment_buttons[9]
+        self.roi_manager.segment_labels = self.SEGMENT_LABELS[9]
         
         self.segment_group.setLayout(self.segment_layout)
         self.layout.addWidget(self.segment_group)
         
+        # One set of Ctrl+1..9 shortcuts owned by the panel, acting on whichever
+        # scheme's buttons are current (rather than one set per page of buttons)
+        self.segment_shortcuts = []
+        for segment in range(1, max(self.SEGMENT_LABELS) + 1):
+            shortcut = QShortcut(QKeySequence(f"Ctrl+{segment}"), self)
+            shortcut.activated.connect(partial(self.on_segment_shortcut, segment))
+            self.segment_shortcuts.append(shortcut)
+        
         # ROI Controls
         self.roi_group = QGroupBox("ROI Controls")
         self.roi_layout = QVBoxLayout()
@@ -157,6 +172,8 @@ class ControlPanel(QWidget):
 
     def update_window_level(self, window, level):
         """Update window/level controls when changed from outside"""
+        self._cancel_pending_window_level()
+        
         # Update inputs and sliders without triggering their signals
         self.window_input.blockSignals(True)
         self.window_slider.blockSignals(True)
@@ -182,8 +199,8 @@ class ControlPanel(QWidget):
         self.window_input.setValue(window)
         self.window_input.blockSignals(False)
         
-        # Emit signal with new window/level values
-        self.window_level_changed.emit(window, self.level_slider.value())
+        # Schedule a (debounced) window/level update
+        self._schedule_window_level(window, self.level_slider.value())
     
     def on_level_slider_changed(self):
         """Handle level slider value change"""
@@ -194,8 +211,27 @@ class ControlPanel(QWidget):
         self.level_input.setValue(level)
         self.level_input.blockSignals(False)
         
-        # Emit signal with new window/level values
-        self.window_level_changed.emit(self.window_slider.value(), level)
+        # Schedule a (debounced) window/level update
+        self._schedule_window_level(self.window_slider.value(), level)
+    
+    def _schedule_window_level(self, window, level):
+        """Remember the latest slider values and emit them when the timer fires"""
+        self._pending_window_level = (window, level)
+        if not self._wl_timer.isActive():
+            self._wl_timer.start()
+    
+    def _cancel_pending_window_level(self):
+        """Drop a pending slider update that has been superseded"""
+        self._wl_timer.stop()
+        self._pending_window_level = None
+    
+    def _emit_pending_window_level(self):
+        """Emit the most recent window/level values from the sliders"""
+        if self._pending_window_level is None:
+            return
+        window, level = self._pending_window_level
+        self._pending_window_level = None
+        self.window_level_changed.emit(window, level)
     
     def on_window_input_changed(self):
         """Handle window input value change"""
@@ -207,6 +243,7 @@ class ControlPanel(QWidget):
         self.window_slider.blockSignals(False)
         
         # Emit signal with new window/level values
+        self._cancel_pending_window_level()
         self.window_level_changed.emit(window, self.level_input.value())
     
     def on_level_input_changed(self):
@@ -219,52 +256,56 @@ class ControlPanel(QWidget):
         self.level_slider.blockSignals(False)
         
         # Emit signal with new window/level values
+        self._cancel_pending_window_level()
         self.window_level_changed.emit(self.window_input.value(), level)
     
     def on_scheme_changed(self, button):
         """Handle segmentation scheme change"""
         scheme = self.scheme_buttons.id(button)
         
-        # Clear existing segment buttons
-        for i in reversed(range(self.segment_layout.count())): 
-            self.segment_layout.itemAt(i).widget().setParent(None)
-        
-        self.segment_buttons = {}
-        
         if scheme == 9:
             # 9-segment scheme
             self.roi_manager.set_segmentation_scheme("9-segment")
-            segments = [1, 2, 3, 4, 5, 6, 7, 8, 9]
-            segment_labels = ["1", "2", "3", "4a", "4b", "5", "6", "7", "8"]
-            self.roi_manager.segment_labels = segment_labels
         else:
             # 4-segment scheme
             self.roi_manager.set_segmentation_scheme("4-segment")
-            segments = [1, 2, 3, 4]
-            segment_labels = ["Left Lateral", "Left Medial", "Right Anterior", "Right Posterior"]
-            self.roi_manager.segment_labels = segment_labels
-        
-        # Create new segment buttons
-        row, col = 0, 0
-        for segment in segments:
-            btn_text = f"Segment {segment_labels[segment-1]}" if scheme == 9 else segment_labels[segment-1]
+        self.roi_manager.segment_labels = self.SEGMENT_LABELS[scheme]
+        
+        # Show the cached buttons for the selected scheme
+        for page_scheme, page in self.segment_pages.items():
+            page.setVisible(page_scheme == scheme)
+        self.segment_buttons = self.scheme_segment_buttons[scheme]
+        segments = list(self.segment_buttons)
+        
+        # Select first segment
+        self.on_segment_selected(segments[0])
+    
+    def _create_segment_buttons(self, scheme):
+        """Create the page of segment buttons for a segmentation scheme"""
+        page = QWidget()
+        page_layout = QGridLayout(page)
+        page_layout.setContentsMargins(0, 0, 0, 0)
+        
+        segment_labels = self.SEGMENT_LABELS[scheme]
+        num_cols = 3 if scheme == 9 else 2
+        buttons = {}
+        for i, label in enumerate(segment_labels):
+            segment = i + 1
+            btn_text = f"Segment {label}" if scheme == 9 else label
             btn = QPushButton(btn_text)
             btn.setCheckable(True)
-            btn.clicked.connect(lambda checked, s=segment: self.on_segment_selected(s))
+            btn.clicked.connect(partial(self.on_segment_selected, segment))
             
-            if segment < 10:
-                # Create shortcut using the number key (1-9)
-                btn.setShortcut(QKeySequence(f"Ctrl+{segment}"))
-
-            self.segment_buttons[segment] = btn
-            self.segment_layout.addWidget(btn, row, col)
-            col += 1
-            if (col > 2 and scheme == 9) or (col > 1 and scheme == 4):
-                col = 0
-                row += 1
+            buttons[segment] = btn
+            page_layout.addWidget(btn, i // num_cols, i % num_cols)
         
-        # Select first segment
-        self.on_segment_selected(segments[0])
+        return page, buttons
+    
+    def on_segment_shortcut(self, segment):
+        """Handle a Ctrl+number segment shortcut"""
+        # Numbers beyond the current scheme's segments do nothing
+        if segment in self.segment_buttons:
+            self.on_segment_selected(segment)
     
     def on_segment_selected(self, segment):
         """Handle segment selection"""
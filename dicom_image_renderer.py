@@ -1,9 +1,33 @@
+import math
 import numpy as np
 from PyQt5.QtCore import QObject, Qt, QRectF, QPointF
 from PyQt5.QtGui import QImage, QPixmap, QPainter, QPen, QBrush, QColor
 
 class DicomImageRenderer(QObject):
     """Handles rendering of DICOM images with window/level and overlays"""
+
+    # Short labels drawn on the image for the 4-segment scheme
+    FOUR_SEGMENT_ABBREVIATIONS = {
+        "Left Lateral": "LL",
+        "Left Medial": "LM",
+        "Right Anterior": "RA",
+        "Right Posterior": "RP",
+    }
+
+    # Overlay colors per liver segment, built once at import time
+    SEGMENT_COLORS = {
+        1: QColor(255, 0, 0, 128),    # Red
+        2: QColor(0, 255, 0, 128),    # Green
+        3: QColor(0, 0, 255, 128),    # Blue
+        4: QColor(255, 255, 0, 128),  # Yellow
+        5: QColor(255, 0, 255, 128),  # Magenta
+        6: QColor(0, 255, 255, 128),  # Cyan
+        7: QColor(255, 128, 0, 128),  # Orange
+        8: QColor(128, 0, 255, 128),  # Purple
+        9: QColor(0, 128, 128, 128),  # Teal
+    }
+    DEFAULT_SEGMENT_COLOR = QColor(255, 255, 255, 128)
+
     def __init__(self, parent_widget, dicom_model, roi_manager):
         super().__init__()
         self.parent = parent_widget
@@ -12,19 +36,42 @@ class DicomImageRenderer(QObject):
         self.window = self.dicom_model.default_window
         self.level = self.dicom_model.default_level
         self.pixel_array = None
-        self.pixmap = None
+        self.image = None  # QImage viewing self._display_buf, drawn directly by render()
         self.dicom_size = (0, 0)  # Original DICOM image size
+        self._display_buf = None  # Persistent 8-bit output buffer, reused across updates
+        self._scratch_buf = None  # Persistent float32 scratch buffer for window/level math
+        self._wl_cache_key = None  # (pixel array id, window, level) the image was built from
+        self._lut = None  # Stored value -> display value table for integer images
+        self._lut_key = None  # (dtype, window, level) the lookup table was built for
+        self._rect_cache = None  # ((image size, label size), display rect) from get_pixmap_rect
+        self._pixmap_cache = None  # ((width, height), QPixmap) of the image scaled for display
+
+        # Pens are built once per segment instead of per ROI per repaint
+        self._segment_pens = {}
+        self._no_brush = QBrush(Qt.NoBrush)
     
     def set_image_data(self, pixel_array):
         """Set the image data to render"""
         if pixel_array is None:
             self.pixel_array = None
-            self.pixmap = None
+            self.image = None
             self.dicom_size = (0, 0)
+            self._display_buf = None
+            self._scratch_buf = None
+            self._rect_cache = None
+            self._pixmap_cache = None
             return False
         
         self.pixel_array = pixel_array
         self.dicom_size = pixel_array.shape
+
+        # Only reallocate the display buffer when the image size changes; the
+        # scratch buffer is allocated on demand for non-integer images
+        if self._display_buf is None or self._display_buf.shape != pixel_array.shape:
+            self._display_buf = np.empty(pixel_array.shape, dtype=np.uint8)
+            self._scratch_buf = None
+            self._rect_cache = None
+
         self.apply_window_level()
         return True
     
@@ -32,6 +79,10 @@ class DicomImageRenderer(QObject):
         """Set window/level parameters"""
         if window <= 0:
             window = 1
+
+        # Nothing to do if the parameters haven't changed
+        if window == self.window and level == self.level:
+            return self.pixel_array is not None
             
         self.window = window
         self.level = level
@@ -43,93 +94,149 @@ class DicomImageRenderer(QObject):
         return False
     
     def apply_window_level(self):
-        """Apply window/level to the image data and create a pixmap"""
+        """Apply window/level to the image data and update the display image"""
         if self.pixel_array is None:
             return False
+
+        # Reuse the image if it was already built for this pixel array and window/level
+        cache_key = (id(self.pixel_array), self.window, self.level)
+        if self.image is not None and cache_key == self._wl_cache_key:
+            return True
             
-        # Apply window/level settings
-        lower_bound = self.level - self.window/2
-        upper_bound = self.level + self.window/2
-        
-        display_image = np.clip(self.pixel_array, lower_bound, upper_bound)
-        display_image = ((display_image - lower_bound) / (upper_bound - lower_bound) * 255).astype(np.uint8)
+        dtype = self.pixel_array.dtype
+        if dtype.kind in 'iu' and dtype.itemsize <= 2 and dtype.isnative:
+            # 8/16-bit integer data (the usual DICOM case): a single table
+            # lookup per pixel. Signed values are looked up through their
+            # unsigned bit pattern, which is how the table is laid out
+            lut = self._get_window_level_lut(dtype)
+            indices = self.pixel_array.view(np.dtype(f'u{dtype.itemsize}'))
+            np.take(lut, indices, out=self._display_buf, mode='clip')
+        else:
+            # Apply window/level settings
+            lower_bound = self.level - self.window/2
+            scale = 255.0 / self.window
+            
+            if self._scratch_buf is None:
+                self._scratch_buf = np.empty(self.pixel_array.shape, dtype=np.float32)
+            
+            # Shift, scale and clip to the 8-bit range entirely within the
+            # preallocated scratch buffer, then write into the display buffer
+            scratch = self._scratch_buf
+            np.subtract(self.pixel_array, lower_bound, out=scratch, dtype=np.float32)
+            np.multiply(scratch, scale, out=scratch)
+            np.clip(scratch, 0, 255, out=scratch)
+            np.copyto(self._display_buf, scratch, casting='unsafe')
         
-        # Convert to QImage and then to pixmap
-        height, width = display_image.shape
+        # Wrap the buffer in a QImage without copying; the buffer lives on
+        # self, so the image data stays valid until the next update
+        height, width = self._display_buf.shape
         bytes_per_line = width
-        q_image = QImage(display_image.data, width, height, bytes_per_line, QImage.Format_Grayscale8)
-        
-        self.pixmap = QPixmap.fromImage(q_image)
+        self.image = QImage(self._display_buf.data, width, height, bytes_per_line, QImage.Format_Grayscale8)
+        self._wl_cache_key = cache_key
+        self._pixmap_cache = None
         return True
     
-    def get_pixmap(self):
-        """Get the current pixmap"""
-        return self.pixmap
+    def _get_window_level_lut(self, dtype):
+        """Get the 8-bit lookup table for an integer dtype at the current window/level"""
+        lut_key = (dtype, self.window, self.level)
+        if lut_key == self._lut_key:
+            return self._lut
+        
+        # Entry i holds the display value for the stored value whose unsigned
+        # bit pattern is i
+        num_values = 1 << (8 * dtype.itemsize)
+        values = np.arange(num_values, dtype=np.dtype(f'u{dtype.itemsize}')).view(dtype)
+        
+        lower_bound = self.level - self.window/2
+        scale = 255.0 / self.window
+        lut = (values.astype(np.float32) - lower_bound) * scale
+        np.clip(lut, 0, 255, out=lut)
+        
+        self._lut = lut.astype(np.uint8)
+        self._lut_key = lut_key
+        return self._lut
+    
+    def get_image(self):
+        """Get the current display image"""
+        return self.image
+    
+    def get_cached_pixmap(self, label_size):
+        """Get the image as a pixmap already scaled to its display rectangle"""
+        if self.image is None:
+            return None
+        
+        # Repaints that don't change the image (ROI drawing, overlays) reuse
+        # the scaled pixmap; it is rebuilt when the image or size changes
+        rect = self.get_pixmap_rect(label_size)
+        size_key = (int(rect.width()), int(rect.height()))
+        if self._pixmap_cache is None or self._pixmap_cache[0] != size_key:
+            pixmap = QPixmap.fromImage(self.image).scaled(
+                size_key[0], size_key[1], Qt.IgnoreAspectRatio, Qt.FastTransformation)
+            self._pixmap_cache = (size_key, pixmap)
+        
+        return self._pixmap_cache[1]
     
     def get_pixmap_rect(self, label_size):
-        """Calculate the rectangle where the pixmap will be drawn"""
-        if self.pixmap is None:
+        """Calculate the rectangle where the image will be drawn"""
+        if self.image is None:
             return QRectF()
+        
+        # Reuse the last rectangle if neither the image nor label size changed
+        rect_key = (self.dicom_size, label_size.width(), label_size.height())
+        if self._rect_cache is not None and self._rect_cache[0] == rect_key:
+            return self._rect_cache[1]
             
         # Calculate scaled size maintaining aspect ratio
-        pixmap_size = self.pixmap.size()
+        pixmap_size = self.image.size()
         scaled_size = pixmap_size
         scaled_size.scale(label_size, Qt.KeepAspectRatio)
         
-        # Calculate position to center the pixmap
+        # Calculate position to center the image
         x = (label_size.width() - scaled_size.width()) / 2
         y = (label_size.height() - scaled_size.height()) / 2
         
-        return QRectF(x, y, scaled_size.width(), scaled_size.height())
+        rect = QRectF(x, y, scaled_size.width(), scaled_size.height())
+        self._rect_cache = (rect_key, rect)
+        return rect
     
     def render(self, painter, label_size, rois=None, drawing_roi=None):
         """Render the image with current window/level settings and ROIs"""
-        if self.pixmap is None:
+        if self.image is None:
             return False
         
-        # Get the rectangle where the pixmap will be drawn
+        # Get the rectangle where the image will be drawn
         pixmap_rect = self.get_pixmap_rect(label_size)
         
-        # Draw the pixmap
-        painter.drawPixmap(
-            pixmap_rect.toRect(),
-            self.pixmap,
-            self.pixmap.rect()
-        )
+        # Draw the pre-scaled base image
+        painter.drawPixmap(pixmap_rect.topLeft(), self.get_cached_pixmap(label_size))
         
         # Draw ROIs if provided
         if rois:
+            # Hoist the display transform out of the per-ROI loop
+            rect_x, rect_y = pixmap_rect.x(), pixmap_rect.y()
+            rect_w, rect_h = pixmap_rect.width(), pixmap_rect.height()
+            rect_min = min(rect_w, rect_h)
+            abbreviate = self.roi_manager.segmentation_scheme == "4-segment"
+            label_pen = QPen(Qt.white, 1)
+            painter.setBrush(self._no_brush)
+            
             for roi in rois:
-                if self.roi_manager.segmentation_scheme == "4-segment":
-                    if roi.segment_label == "Left Lateral":
-                        segment_label_disp = "LL"
-                    elif roi.segment_label == "Left Medial":
-                        segment_label_disp = "LM"
-                    elif roi.segment_label == "Right Anterior":
-                        segment_label_disp = "RA"
-                    elif roi.segment_label == "Right Posterior":
-                        segment_label_disp = "RP"
-                    else:
-                        segment_label_disp = roi.segment_label
+                if abbreviate:
+                    segment_label_disp = self.FOUR_SEGMENT_ABBREVIATIONS.get(roi.segment_label, roi.segment_label)
                 else:
                     segment_label_disp = roi.segment_label
                 
-                
                 # Scale ROI coordinates to current display
-                scaled_x = pixmap_rect.x() + (roi.center_x * pixmap_rect.width())
-                scaled_y = pixmap_rect.y() + (roi.center_y * pixmap_rect.height())
-                scaled_radius = roi.radius_px * min(pixmap_rect.width(), pixmap_rect.height())
-                
-                # Set color based on segment
-                color = self.get_segment_color(roi.segment)
+                scaled_x = rect_x + (roi.center_x * rect_w)
+                scaled_y = rect_y + (roi.center_y * rect_h)
+                scaled_radius = roi.radius_px * rect_min
                 
-                # Draw circle
-                painter.setPen(QPen(color, 2, Qt.SolidLine))
-                painter.setBrush(QBrush(color, Qt.NoBrush))
+                # Draw circle with the cached pen for this segment
+                painter.setPen(self.get_segment_pen(roi.segment))
                 painter.drawEllipse(QPointF(scaled_x, scaled_y), scaled_radius, scaled_radius)
                 
                 # Draw segment label
-                painter.setPen(QPen(Qt.white, 1))
+                painter.setPen(label_pen)
                 painter.drawText(QRectF(scaled_x - 10, scaled_y - 10, 20, 20), 
                                 Qt.AlignCenter, segment_label_disp)
         
@@ -139,30 +246,31 @@ class DicomImageRenderer(QObject):
             current_pos = drawing_roi['current']
             
             # Calculate center and radius
-            center = QPointF(start_pos)
-            radius = (current_pos - start_pos).manhattanLength() / 2
+            radius = self.drag_radius(start_pos, current_pos)
             
-            # Draw preview circle
-            painter.setPen(QPen(Qt.yellow, 2, Qt.DashLine))
-            painter.setBrush(QBrush(Qt.yellow, Qt.NoBrush))
-            painter.drawEllipse(center, radius, radius)
+            # Draw preview circle, skipping the degenerate one on the initial click
+            if radius >= 1:
+                painter.setPen(QPen(Qt.yellow, 2, Qt.DashLine))
+                painter.setBrush(QBrush(Qt.yellow, Qt.NoBrush))
+                painter.drawEllipse(QPointF(start_pos), radius, radius)
         
         return True
     
+    def drag_radius(self, start_pos, current_pos):
+        """Radius (display pixels) of an ROI dragged from start_pos: half the Euclidean drag distance"""
+        return math.hypot(current_pos.x() - start_pos.x(), current_pos.y() - start_pos.y()) * 0.5
+    
     def get_segment_color(self, segment):
         """Get color based on liver segment"""
-        colors = {
-            1: QColor(255, 0, 0, 128),    # Red
-            2: QColor(0, 255, 0, 128),    # Green
-            3: QColor(0, 0, 255, 128),    # Blue
-            4: QColor(255, 255, 0, 128),  # Yellow
-            5: QColor(255, 0, 255, 128),  # Magenta
-            6: QColor(0, 255, 255, 128),  # Cyan
-            7: QColor(255, 128, 0, 128),  # Orange
-            8: QColor(128, 0, 255, 128),  # Purple
-            9: QColor(0, 128, 128, 128),  # Teal
-        }
-        return colors.get(segment, QColor(255, 255, 255, 128))
+        return self.SEGMENT_COLORS.get(segment, self.DEFAULT_SEGMENT_COLOR)
+    
+    def get_segment_pen(self, segment):
+        """Get the (cached) outline pen for a liver segment"""
+        pen = self._segment_pens.get(segment)
+        if pen is None:
+            pen = QPen(self.get_segment_color(segment), 2, Qt.SolidLine)
+            self._segment_pens[segment] = pen
+        return pen
     
     def pixel_to_normalized(self, pixel_x, pixel_y):
         """Convert pixel coordinates to normalized coordinates (0-1)"""
@@ -203,16 +311,12 @@ class DicomImageRenderer(QObject):
     
     def get_pixel_value(self, norm_x, norm_y):
         """Get original pixel value at given normalized coordinates"""
-        if self.pixel_array is None or not (0 <= norm_x <= 1 and 0 <= norm_y <= 1):
+        # Half-open range check keeps the pixel index inside the image, so no
+        # separate conversion or bounds check is needed on this hover path
+        if self.pixel_array is None or not (0 <= norm_x < 1 and 0 <= norm_y < 1):
             return None
-            
-        pixel_x, pixel_y = self.normalized_to_pixel(norm_x, norm_y)
         
-        if pixel_x is None or pixel_y is None:
-            return None
-            
-        # Ensure coordinates are within bounds
-        if 0 <= pixel_y < self.dicom_size[0] and 0 <= pixel_x < self.dicom_size[1]:
-            return self.pixel_array[pixel_y, pixel_x]
-            
-        return None
\ No newline at end of file
+        height, width = self.dicom_size
+        pixel_x = min(int(norm_x * width), width - 1)
+        pixel_y = min(int(norm_y * height), height - 1)
+        return self.pixel_array[pixel_y, pixel_x]
\ No newline at end of file
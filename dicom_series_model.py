@@ -1,7 +1,27 @@
 import os
+import re
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 import pydicom
+from pydicom.multival import MultiValue
+from pydicom.uid import ExplicitVRLittleEndian, ImplicitVRLittleEndian
 import numpy as np
-from PyQt5.QtCore import QObject, pyqtSignal
+from PyQt5.QtCore import (QObject, QThread, QThreadPool, QRunnable, QCoreApplication,
+                          pyqtSignal, pyqtSlot)
+
+logger = logging.getLogger(__name__)
+
+
+def classify_orientations(orientation_vecs):
+    """Classify ImageOrientationPatient vectors ((6,) or (N, 6)) as 1=sagittal, 2=coronal, 3=axial
+    
+    The slice normal's dominant axis decides, so oblique and slightly
+    non-unit direction cosines are still classified.
+    """
+    orientation_vecs = np.asarray(orientation_vecs, dtype=np.float64)
+    normals = np.cross(orientation_vecs[..., :3], orientation_vecs[..., 3:])
+    return (np.argmax(np.abs(normals), axis=-1) + 1).astype(np.int8)
 
 class DicomSeriesModel(QObject):
     """Model class for loading and managing DICOM data"""
@@ -9,13 +29,46 @@ class DicomSeriesModel(QObject):
     # Define signals
     series_loaded = pyqtSignal()
     slice_changed = pyqtSignal(int)  # Current slice index
+    directory_structure_changed = pyqtSignal(list)  # [(tree keys, series path)] just added
+    directory_scan_finished = pyqtSignal()
+    scan_requested = pyqtSignal(str, int)  # root directory, scan id
+    
+    # Number of decoded slices kept in memory
+    PIXEL_CACHE_SIZE = 32
+    
+    # Slices on each side of the current one decoded ahead of time
+    PREFETCH_RADIUS = 5
+    
+    # File extensions treated as DICOM (a tuple so endswith checks all in one call)
+    DICOM_EXTENSIONS = ('.dcm', '.DCM', '.sdcopen')
+    
+    # Header tags the viewer actually reads; everything else (private groups,
+    # large sequences) is skipped when a series is loaded
+    HEADER_TAGS = [
+        'InstanceNumber', 'WindowCenter', 'WindowWidth',
+        'PatientID', 'SeriesDescription', 'SeriesInstanceUID', 'StudyID',
+        'ImagePositionPatient', 'ImageOrientationPatient', 'PixelSpacing',
+        'Rows', 'Columns', 'RescaleSlope', 'RescaleIntercept',
+        'SamplesPerPixel', 'PhotometricInterpretation', 'BitsAllocated',
+        'BitsStored', 'HighBit', 'PixelRepresentation', 'NumberOfFrames',
+    ]
+    
+    # Runs of digits in a file name (the last one is usually the instance number)
+    FILENAME_NUMBER = re.compile(r'\d+')
+    
+    # Transfer syntaxes whose pixel data is a raw little-endian slab that can
+    # be memory-mapped straight from the file
+    UNCOMPRESSED_SYNTAXES = (ExplicitVRLittleEndian, ImplicitVRLittleEndian)
     
     def __init__(self):
         super().__init__()
         self.current_series = None
         self.current_slice_index = 0
+        self._num_slices = 0  # len(current_series), cached for navigation
         self.series_data = {}  # Dictionary of loaded series
-        self.anatomical_positions = {}  # Mapping of anatomical positions
+        self.anatomical_positions = {}  # Series path -> (N, 3) array of slice positions
+        self.slice_orientations = {}  # Series path -> (N,) array of slice orientations
+        self.pixel_data_locations = {}  # Filename -> (offset, dtype, value mask) of the current series' raw pixel data
         self.directory_structure = {}  
         self.current_series_path = None
         self.default_window = 2000
@@ -24,6 +77,20 @@ class DicomSeriesModel(QObject):
         self.current_study_name = ""
         self.current_exam_number = 0
         self.current_series_uid = ""
+        
+        # LRU cache of decoded pixel arrays keyed by (series_path, index)
+        self._decode_pixels = lru_cache(maxsize=self.PIXEL_CACHE_SIZE)(self._read_pixel_data)
+        
+        # Background decoding of the slices around the current one
+        self._prefetch_pool = QThreadPool(self)
+        self._prefetch_pool.setMaxThreadCount(2)
+        self._prefetch_epoch = 0  # bumped to supersede queued prefetches
+        self._prefetch_center = None
+        
+        # Background directory scanning (thread created on first use)
+        self._scan_thread = None
+        self._scan_worker = None
+        self._scan_id = 0
     
     def load_directory(self, root_dir):
         """Scan directory structure recursively and find DICOM series at any level"""
@@ -40,210 +107,382 @@ class DicomSeriesModel(QObject):
         
         return True
     
+    def load_directory_async(self, root_dir):
+        """Scan a directory on a worker thread; the tree fills in as chunks arrive"""
+        if not os.path.exists(root_dir):
+            return False
+        
+        if self._scan_thread is None:
+            self._start_scan_thread()
+        
+        # A new scan supersedes any scan still running
+        self._scan_id += 1
+        self._scan_worker.latest_scan_id = self._scan_id
+        self.directory_structure = {}
+        
+        self.scan_requested.emit(root_dir, self._scan_id)  # queued to the worker thread
+        return True
+    
+    def _start_scan_thread(self):
+        """Create the directory scan worker and its thread"""
+        self._scan_thread = QThread(self)
+        self._scan_worker = DirectoryScanWorker(self)
+        self._scan_worker.moveToThread(self._scan_thread)
+        self.scan_requested.connect(self._scan_worker.run)
+        self._scan_worker.chunk_ready.connect(self._on_scan_chunk)
+        self._scan_worker.finished.connect(self._on_scan_finished)
+        QCoreApplication.instance().aboutToQuit.connect(self.stop_scan_thread)
+        self._scan_thread.start()
+    
+    def stop_scan_thread(self):
+        """Cancel any running scan and stop the worker thread"""
+        if self._scan_thread is None:
+            return
+        
+        self._scan_worker.latest_scan_id = -1
+        self._scan_thread.quit()
+        self._scan_thread.wait()
+    
+    def _on_scan_chunk(self, scan_id, dicom_directories):
+        """Add a chunk of found directories to the tree (ignoring superseded scans)"""
+        if scan_id != self._scan_id:
+            return
+        
+        self._add_to_directory_tree(dicom_directories)
+        self.directory_structure_changed.emit(
+            [(self._tree_keys(dir_info), dir_info['path']) for dir_info in dicom_directories])
+    
+    def _on_scan_finished(self, scan_id):
+        """Report the end of the current scan"""
+        if scan_id == self._scan_id:
+            # Chunks arrive in walk order; sort the finished tree once
+            self.directory_structure = self._sorted_directory_tree(self.directory_structure)
+            self.directory_scan_finished.emit()
+    
     def _find_dicom_directories(self, root_dir):
         """Find all directories containing DICOM files"""
-        dicom_dirs = []
+        return list(self._iter_dicom_directories(root_dir))
+    
+    def _iter_dicom_directories(self, root_dir):
+        """Yield each directory containing DICOM files as it is found"""
+        pending_dirs = [root_dir]
         
-        for root, dirs, files in os.walk(root_dir):
-            # Check if directory contains DICOM files
-            dicom_files = [f for f in files if f.endswith('.dcm') or f.endswith('.DCM') or f.endswith('.sdcopen')]
+        while pending_dirs:
+            current_dir = pending_dirs.pop()
+            has_dicom = False
             
-            if dicom_files:
+            try:
+                with os.scandir(current_dir) as entries:
+                    for entry in entries:
+                        # Skip hidden files and directories
+                        if entry.name.startswith('.'):
+                            continue
+                        
+                        if entry.is_dir(follow_symlinks=False):
+                            pending_dirs.append(entry.path)
+                        elif not has_dicom and entry.name.endswith(self.DICOM_EXTENSIONS):
+                            # One DICOM file is enough to mark the directory
+                            has_dicom = True
+            except OSError as e:
+                logger.warning("Error scanning %s: %s", current_dir, e)
+                continue
+            
+            if has_dicom:
                 # This directory contains DICOM files
-                dicom_dirs.append({
-                    'path': root,
-                    'dicom_count': len(dicom_files),
+                yield {
+                    'path': current_dir,
                     # Get relative path components for tree structure
-                    'components': os.path.relpath(root, root_dir).split(os.sep)
-                })
-        
-        return dicom_dirs
+                    'components': os.path.relpath(current_dir, root_dir).split(os.sep)
+                }
 
     def _build_directory_tree(self, dicom_directories):
         """Build a tree structure from found DICOM directories"""
-        # Group directories by their top-level component
-        top_level_groups = {}
+        self.directory_structure = {}
+        self._add_to_directory_tree(dicom_directories)
         
+        # Every level in alphabetical order, so consumers can iterate without sorting
+        self.directory_structure = self._sorted_directory_tree(self.directory_structure)
+    
+    def _sorted_directory_tree(self, level):
+        """Return a copy of a tree level with its keys (and those below) in alphabetical order"""
+        return {name: self._sorted_directory_tree(content) if isinstance(content, dict) else content
+                for name, content in sorted(level.items())}
+    
+    def _add_to_directory_tree(self, dicom_directories):
+        """Insert found DICOM directories into the existing tree structure"""
         for dir_info in dicom_directories:
-            components = dir_info['components']
-            if components[0] == '.':  # Root directory
-                top_level = 'Root'
-            else:
-                top_level = components[0]
-                
-            if top_level not in top_level_groups:
-                top_level_groups[top_level] = []
-                
-            top_level_groups[top_level].append(dir_info)
-        
-        # Build the tree structure
-        self.directory_structure = {}
+            keys = self._tree_keys(dir_info)
+            
+            # Descend through intermediate levels, creating them as needed
+            current_level = self.directory_structure
+            for key in keys[:-1]:
+                current_level = current_level.setdefault(key, {})
+            
+            # Last component, store the path
+            current_level[keys[-1]] = dir_info['path']
+    
+    def _tree_keys(self, dir_info):
+        """Return the tree keys, top level first, under which a directory is stored"""
+        components = dir_info['components']
         
-        # Get top-level keys in alphabetical order
-        sorted_top_level = sorted(top_level_groups.keys())
+        if components[0] == '.':
+            # Handle root directory specially
+            return ['Root', os.path.basename(dir_info['path'])]
+        if len(components) == 1:
+            # Single level deep, stored under its own name
+            return [components[0], components[0]]
         
-        for top_level in sorted_top_level:
-            self.directory_structure[top_level] = {}
-            dirs = top_level_groups[top_level]
-            
-            for dir_info in dirs:
-                components = dir_info['components']
-                path = dir_info['path']
-                
-                # Skip the top-level component (already used)
-                if components[0] == '.':
-                    # Handle root directory specially
-                    name = os.path.basename(path)
-                    self.directory_structure[top_level][name] = path
-                elif len(components) == 1:
-                    # Single level deep, add directly
-                    self.directory_structure[top_level][components[0]] = path
-                else:
-                    # Create intermediate levels
-                    current_level = self.directory_structure[top_level]
-                    for i in range(1, len(components)):
-                        component = components[i]
-                        
-                        if i == len(components) - 1:
-                            # Last component, store the path
-                            current_level[component] = path
-                        else:
-                            # Intermediate level, create if needed
-                            if component not in current_level:
-                                current_level[component] = {}
-                            
-                            current_level = current_level[component]
+        return components
    
     def load_series(self, series_path):
         """Load a specific series"""
         if not os.path.exists(series_path):
             return False
             
-        # Load all DICOM files in the series
-        dicom_files = [os.path.join(series_path, f) for f in os.listdir(series_path) 
-                      if f.endswith('.dcm') or f.endswith('.DCM')]
+        # Load all DICOM files in the series (scandir entries carry their
+        # file type, so no extra stat per file)
+        with os.scandir(series_path) as entries:
+            dicom_files = [entry.path for entry in entries
+                           if entry.name.endswith(self.DICOM_EXTENSIONS) and entry.is_file()]
         
         if not dicom_files:
             return False
+        
+        # File names usually follow instance order, so sort them numerically
+        # up front; the header sort below is then rarely needed
+        dicom_files.sort(key=self._filename_sort_key)
             
-        # Load the series data
+        # Read the series headers in parallel (I/O bound); pixel data is read
+        # on demand per slice
         series_data = []
-        for dicom_file in dicom_files:
-            try:
-                ds = pydicom.dcmread(dicom_file)
+        pixel_locations = {}
+        failed_files = []
+        max_workers = min(8, os.cpu_count() or 1)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [(dicom_file, executor.submit(self._read_header, dicom_file))
+                       for dicom_file in dicom_files]
+            
+            for dicom_file, future in futures:
+                error = future.exception()
+                if error is not None:
+                    failed_files.append((dicom_file, error))
+                    continue
+                ds, pixel_location = future.result()
+                pixel_locations[dicom_file] = pixel_location
                 series_data.append(ds)
-
-                # try to get window/level from first DICOM file
-                if len(series_data) == 1:
-                    # check for window center/width tags
-                    if hasattr(ds, 'WindowCenter') and hasattr(ds, 'WindowWidth'):
-                        # handle multiple values (pick first one)
-                        if isinstance(ds.WindowCenter, list):
-                            self.default_level = float(ds.WindowCenter[0])
-                        else:
-                            self.default_level = float(ds.WindowCenter)
-                            
-                        if isinstance(ds.WindowWidth, list):
-                            self.default_window = float(ds.WindowWidth[0])
-                        else:
-                            self.default_window = float(ds.WindowWidth)
-                            
-                    if isinstance(ds.PatientID, list):
-                        self.current_study_name = ds.PatientID[0]
-                    else:
-                        self.current_study_name = ds.PatientID
-                        
-                    if isinstance(ds.SeriesDescription, list):
-                        self.current_series_name = ds.SeriesDescription[0]
-                    else:
-                        self.current_series_name = ds.SeriesDescription
-                        
-                    if isinstance(ds.SeriesInstanceUID, list):
-                        self.current_series_uid = ds.SeriesInstanceUID[0]
-                    else:
-                        self.current_series_uid = ds.SeriesInstanceUID
-                        
-                    if isinstance(ds.StudyID, list):
-                        self.current_exam_number = ds.StudyID[0]
-                    else:
-                        self.current_exam_number = ds.StudyID
-                        
-                        
-            except Exception as e:
-                print(f"Error loading {dicom_file}: {e}")
         
-        # Sort by instance number if available
-        series_data.sort(key=lambda x: getattr(x, 'InstanceNumber', 0))
+        # Report unreadable files once rather than per file
+        if failed_files:
+            logger.warning("Failed to load %d file(s) in %s, e.g. %s",
+                           len(failed_files), series_path,
+                           "; ".join(f"{name}: {error}" for name, error in failed_files[:10]))
+        
+        # Sort by instance number if available, only when the file name
+        # order did not already produce it
+        instance_numbers = [getattr(ds, 'InstanceNumber', 0) for ds in series_data]
+        if any(a > b for a, b in zip(instance_numbers, instance_numbers[1:])):
+            order = sorted(range(len(series_data)), key=instance_numbers.__getitem__)
+            series_data = [series_data[i] for i in order]
        
         if not series_data:
             return False
+        
+        # try to get window/level and series info from the first DICOM file
+        try:
+            self._read_series_info(series_data[0])
+        except Exception as e:
+            logger.warning("Error reading series info from %s: %s", series_data[0].filename, e)
             
-        # Store the series data
+        # Store the series data, dropping pixels decoded for any previous load
+        self._decode_pixels.cache_clear()
+        self._prefetch_center = None
+        self.pixel_data_locations = pixel_locations  # Replaced, so it never outgrows one series
         self.series_data[series_path] = series_data
         self.current_series = series_data
         self.current_series_path = series_path
         self.current_slice_index = 0
+        self._num_slices = len(series_data)
         
-        # Update anatomical positions for this series
-        self.update_anatomical_positions(series_path)
+        # Parse slice positions and orientations for this series
+        self._index_slice_geometry(series_path, series_data)
         
         # Emit signal that series has been loaded
         self.series_loaded.emit()
         
         return True
     
+    def _filename_sort_key(self, path):
+        """Sort key ordering files by the last number in their name, then by name"""
+        name = os.path.basename(path)
+        numbers = self.FILENAME_NUMBER.findall(name)
+        return (int(numbers[-1]) if numbers else -1, name)
+    
+    def _read_header(self, dicom_file):
+        """Read a DICOM header and locate its raw pixel data, if it can be mapped"""
+        with open(dicom_file, 'rb') as f:
+            ds = pydicom.dcmread(f, stop_before_pixels=True, defer_size="64 KB",
+                                 specific_tags=self.HEADER_TAGS)
+            # The reader stops at the start of the Pixel Data element
+            pixel_location = self._locate_pixel_data(f, ds)
+        
+        return ds, pixel_location
+    
+    def _locate_pixel_data(self, f, ds):
+        """Return (offset, dtype, value mask) of uncompressed single-frame pixel data, else None"""
+        file_meta = getattr(ds, 'file_meta', None)
+        transfer_syntax = getattr(file_meta, 'TransferSyntaxUID', None)
+        if transfer_syntax not in self.UNCOMPRESSED_SYNTAXES:
+            return None
+        
+        bits_allocated = getattr(ds, 'BitsAllocated', None)
+        pixel_representation = getattr(ds, 'PixelRepresentation', 0)
+        if (bits_allocated not in (8, 16) or getattr(ds, 'SamplesPerPixel', 1) != 1
+                or int(getattr(ds, 'NumberOfFrames', 1) or 1) != 1):
+            return None
+        
+        # Signed values narrower than their container need sign extension,
+        # which only the full decoder does; unsigned ones just drop the unused
+        # high bits (e.g. legacy overlays), as the decoder would
+        bits_stored = getattr(ds, 'BitsStored', bits_allocated)
+        if bits_stored != bits_allocated:
+            if pixel_representation or not 0 < bits_stored < bits_allocated:
+                return None
+            value_mask = (1 << bits_stored) - 1
+        else:
+            value_mask = None
+        
+        # Element header: tag, then (explicit VR) VR + reserved bytes, then length
+        header = f.read(12)
+        if len(header) < 8 or header[:4] != b'\xe0\x7f\x10\x00':
+            return None
+        if transfer_syntax == ExplicitVRLittleEndian:
+            value_offset = 12
+            length = int.from_bytes(header[8:12], 'little')
+        else:
+            value_offset = 8
+            length = int.from_bytes(header[4:8], 'little')
+        
+        dtype = self._native_dtype(ds)
+        if length < ds.Rows * ds.Columns * dtype.itemsize:
+            return None
+        
+        return f.tell() - len(header) + value_offset, dtype, value_mask
+    
+    def _native_dtype(self, ds):
+        """Return the stored pixel dtype from PixelRepresentation/BitsAllocated, if known"""
+        bits_allocated = getattr(ds, 'BitsAllocated', None)
+        if bits_allocated not in (8, 16, 32):
+            return None
+        
+        pixel_representation = getattr(ds, 'PixelRepresentation', 0)
+        return np.dtype(f"<{'i' if pixel_representation else 'u'}{bits_allocated // 8}")
+    
+    def _read_series_info(self, ds):
+        """Read default window/level and series identifiers from a DICOM header"""
+        # check for window center/width tags
+        if hasattr(ds, 'WindowCenter') and hasattr(ds, 'WindowWidth'):
+            self.default_level = float(self._first_value(ds.WindowCenter))
+            self.default_window = float(self._first_value(ds.WindowWidth))
+        
+        self.current_study_name = self._first_value(getattr(ds, 'PatientID', ""))
+        self.current_series_name = self._first_value(getattr(ds, 'SeriesDescription', ""))
+        self.current_series_uid = self._first_value(getattr(ds, 'SeriesInstanceUID', ""))
+        self.current_exam_number = self._first_value(getattr(ds, 'StudyID', 0))
+    
+    def _first_value(self, value):
+        """Return the first value of a multi-valued element (pick first one)"""
+        if isinstance(value, (list, MultiValue)):
+            return value[0] if value else None
+        return value
+    
     def get_current_slice(self):
         """Return current slice data"""
-        if not self.current_series or self.current_slice_index >= len(self.current_series):
+        if not 0 <= self.current_slice_index < self._num_slices:
             return None
             
         return self.current_series[self.current_slice_index]
     
     def get_slice(self, index):
         """Return slice at specified index"""
-        if not self.current_series or index >= len(self.current_series):
+        if not 0 <= index < self._num_slices:
             return None
             
         return self.current_series[index]
     
     def get_slice_pixel_data(self, index):
         """Return pixel data for slice at specified index"""
-        slice_data = self.get_slice(index)
-        if slice_data is None:
+        if self.get_slice(index) is None:
             return None
+        
+        return self._decode_pixels(self.current_series_path, index)
+    
+    def prefetch_slices(self, center_index):
+        """Decode the slices around center_index into the pixel cache in the background"""
+        if not self._num_slices or self._prefetch_center == (self.current_series_path, center_index):
+            return
+        self._prefetch_center = (self.current_series_path, center_index)
+        
+        # Drop queued work for the previous position; running tasks check the epoch
+        self._prefetch_epoch += 1
+        self._prefetch_pool.clear()
+        
+        # Nearest slices first, alternating forward and back
+        for offset in range(1, self.PREFETCH_RADIUS + 1):
+            for index in (center_index + offset, center_index - offset):
+                if 0 <= index < self._num_slices:
+                    self._prefetch_pool.start(SlicePrefetchTask(
+                        self, self.current_series_path, index, self._prefetch_epoch))
+    
+    def _read_pixel_data(self, series_path, index):
+        """Read and decode pixel data for a slice (series are loaded without it)"""
+        ds = self.series_data[series_path][index]
+        pixel_location = self.pixel_data_locations.get(ds.filename)
+        
+        if pixel_location is not None:
+            # Uncompressed: map the pixel bytes directly instead of re-parsing the file
+            offset, dtype, value_mask = pixel_location
+            pixel_array = np.memmap(ds.filename, dtype=dtype, mode='r', offset=offset,
+                                    shape=(ds.Rows, ds.Columns)).view(np.ndarray)
+            if value_mask is not None:
+                pixel_array = pixel_array & dtype.type(value_mask)
+        else:
+            pixel_array = pydicom.dcmread(ds.filename).pixel_array
             
-        return slice_data.pixel_array
+            # Keep grayscale pixels in their stored integer type so the
+            # render path never works on upcast copies
+            dtype = self._native_dtype(ds)
+            if (dtype is not None and pixel_array.ndim == 2
+                    and pixel_array.dtype.kind in 'iu' and pixel_array.dtype != dtype):
+                pixel_array = pixel_array.astype(dtype, copy=False)
+        
+        # Cached arrays are shared between callers, so guard against in-place edits
+        pixel_array.flags.writeable = False
+        return pixel_array
     
     def next_slice(self):
         """Move to next slice"""
-        if not self.current_series:
-            return False
-            
-        if self.current_slice_index < len(self.current_series) - 1:
-            self.current_slice_index += 1
-            self.slice_changed.emit(self.current_slice_index)
-            return True
-            
-        return False
+        return self.advance_slices(1)
     
     def previous_slice(self):
         """Move to previous slice"""
-        if not self.current_series:
+        return self.advance_slices(-1)
+    
+    def advance_slices(self, steps):
+        """Move by several slices at once (clamped), emitting slice_changed once"""
+        if not self._num_slices:
             return False
-            
-        if self.current_slice_index > 0:
-            self.current_slice_index -= 1
-            self.slice_changed.emit(self.current_slice_index)
-            return True
-            
-        return False
+        
+        index = min(max(self.current_slice_index + steps, 0), self._num_slices - 1)
+        if index == self.current_slice_index:
+            return False
+        
+        self.current_slice_index = index
+        self.slice_changed.emit(self.current_slice_index)
+        return True
     
     def set_slice_index(self, index):
         """Set the current slice index"""
-        if not self.current_series:
-            return False
-            
-        if 0 <= index < len(self.current_series):
+        if 0 <= index < self._num_slices:
             self.current_slice_index = index
             self.slice_changed.emit(self.current_slice_index)
             return True
@@ -252,24 +491,32 @@ class DicomSeriesModel(QObject):
     
     def get_num_slices(self):
         """Get the number of slices in the current series"""
-        if not self.current_series:
-            return 0
-            
-        return len(self.current_series)
+        return self._num_slices
     
-    def update_anatomical_positions(self, series_path):
-        """Map anatomical positions for a series"""
-        if series_path not in self.anatomical_positions:
-            self.anatomical_positions[series_path] = {}
+    def _index_slice_geometry(self, series_path, series_data):
+        """Parse slice positions and orientations into arrays in one pass over the headers"""
+        num_slices = len(series_data)
+        positions = np.empty((num_slices, 3), dtype=np.float64)
+        orientation_vecs = np.zeros((num_slices, 6), dtype=np.float64)
+        has_orientation = np.zeros(num_slices, dtype=bool)
+        
+        for idx, ds in enumerate(series_data):
+            if hasattr(ds, 'ImagePositionPatient'):
+                positions[idx] = ds.ImagePositionPatient
+            else:
+                # If no position info, use slice index as z-coordinate
+                positions[idx] = (0, 0, idx)
             
-            # Map slice indices to anatomical positions
-            for idx, ds in enumerate(self.series_data[series_path]):
-                if hasattr(ds, 'ImagePositionPatient'):
-                    pos = ds.ImagePositionPatient
-                    self.anatomical_positions[series_path][idx] = pos
-                else:
-                    # If no position info, use slice index as z-coordinate
-                    self.anatomical_positions[series_path][idx] = (0, 0, idx)
+            if hasattr(ds, 'ImageOrientationPatient'):
+                orientation_vecs[idx] = ds.ImageOrientationPatient
+                has_orientation[idx] = True
+        
+        # One batched classification over all slices (0 marks unknown)
+        orientations = classify_orientations(orientation_vecs)
+        orientations[~has_orientation] = 0
+        
+        self.anatomical_positions[series_path] = positions
+        self.slice_orientations[series_path] = orientations
     
     def get_directory_structure(self):
         """Return the directory structure"""
@@ -284,16 +531,61 @@ class DicomSeriesModel(QObject):
         return self.anatomical_positions
     
     def get_slice_orientations(self, series_path):
-        """Return the slice orientations for a series"""
-        orientations = {}
-        
-        if series_path in self.series_data:
-            for idx, ds in enumerate(self.series_data[series_path]):
-                if hasattr(ds, 'ImageOrientationPatient'):
-                    orientation_vec = ds.ImageOrientationPatient
-                    orientation_vec_cross = np.cross(orientation_vec[:3], orientation_vec[3:])
-                    orientation_vec_cross_rounded = [round(abs(val), 0) for val in orientation_vec_cross]
-                    orientation = orientation_vec_cross_rounded.index(1.0) + 1
-                    orientations[idx] = orientation
-        
-        return orientations
\ No newline at end of file
+        """Return the (N,) array of slice orientations for a series"""
+        return self.slice_orientations.get(series_path, np.zeros(0, dtype=np.int8))
+
+
+class DirectoryScanWorker(QObject):
+    """Scans a directory tree for DICOM series on a background thread"""
+    
+    # Define signals
+    chunk_ready = pyqtSignal(int, list)  # scan id, found directories
+    finished = pyqtSignal(int)  # scan id
+    
+    # Number of found directories reported per chunk
+    CHUNK_SIZE = 64
+    
+    def __init__(self, dicom_model):
+        super().__init__()
+        self.dicom_model = dicom_model
+        self.latest_scan_id = 0  # set from the UI thread to supersede a scan
+    
+    @pyqtSlot(str, int)
+    def run(self, root_dir, scan_id):
+        """Walk root_dir, emitting found directories in chunks"""
+        chunk = []
+        for dir_info in self.dicom_model._iter_dicom_directories(root_dir):
+            if scan_id != self.latest_scan_id:
+                # A newer scan was requested (or the app is closing)
+                return
+            
+            chunk.append(dir_info)
+            if len(chunk) >= self.CHUNK_SIZE:
+                self.chunk_ready.emit(scan_id, chunk)
+                chunk = []
+        
+        if chunk:
+            self.chunk_ready.emit(scan_id, chunk)
+        self.finished.emit(scan_id)
+
+
+class SlicePrefetchTask(QRunnable):
+    """Decodes one slice into the model's pixel cache on a pool thread"""
+    
+    def __init__(self, dicom_model, series_path, index, epoch):
+        super().__init__()
+        self.dicom_model = dicom_model
+        self.series_path = series_path
+        self.index = index
+        self.epoch = epoch
+    
+    def run(self):
+        """Decode the slice unless a newer prefetch request superseded this one"""
+        if self.epoch != self.dicom_model._prefetch_epoch:
+            return
+        
+        try:
+            self.dicom_model._decode_pixels(self.series_path, self.index)
+        except Exception as e:
+            # The display path will report the error if the slice is shown
+            logger.debug("Prefetch of slice %d failed: %s", self.index, e)
\ No newline at end of file
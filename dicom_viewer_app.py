@@ -1,5 +1,5 @@
 from PyQt5.QtWidgets import QMainWindow, QWidget, QHBoxLayout, QFileDialog, QDialog
-from PyQt5.QtCore import Qt, pyqtSlot
+from PyQt5.QtCore import Qt, QTimer, pyqtSlot
 
 from dicom_image_renderer import DicomImageRenderer
 from series_navigator_panel import SeriesNavigatorPanel
@@ -84,22 +84,37 @@ class DicomViewerApp(QMainWindow):
         # Connect navigator panel signals
         self.navigator_panel.series_selected.connect(self.dicom_model.load_series)
         self.navigator_panel.copy_rois_requested.connect(self.show_copy_rois_dialog)
+        self.dicom_model.directory_structure_changed.connect(self.navigator_panel.add_series_entries)
         
-        # Connect model signals
-        self.dicom_model.series_loaded.connect(self.image_viewer.update_display)
-        self.dicom_model.series_loaded.connect(self.stats_panel.update_statistics)
+        # Display refreshes requested within one event loop tick are collapsed
+        # into a single update_display call
+        self._display_timer = QTimer(self)
+        self._display_timer.setSingleShot(True)
+        self._display_timer.setInterval(0)
+        self._display_timer.timeout.connect(self.image_viewer.update_display)
+        
+        # Statistics refresh only once scrolling pauses; slice, series and ROI
+        # changes all go through this timer so a burst refreshes the table once
+        self._stats_timer = QTimer(self)
+        self._stats_timer.setSingleShot(True)
+        self._stats_timer.setInterval(50)
+        self._stats_timer.timeout.connect(self.stats_panel.update_statistics)
+        
+        # Connect model signals (on_series_loaded redraws once the new
+        # window/level is applied)
+        self.dicom_model.series_loaded.connect(self.schedule_statistics_update)
         self.dicom_model.series_loaded.connect(self.on_series_loaded)
         self.dicom_model.series_loaded.connect(self.image_viewer.update_series_label)
         self.dicom_model.slice_changed.connect(self.image_viewer.update_display)
-        self.dicom_model.slice_changed.connect(self.stats_panel.update_statistics)
+        self.dicom_model.slice_changed.connect(self.schedule_statistics_update)
         
         # Connect ROI manager signals
         self.roi_manager.rois_changed.connect(self.image_viewer.update_display)
-        self.roi_manager.rois_changed.connect(self.stats_panel.update_statistics)
+        self.roi_manager.rois_changed.connect(self.schedule_statistics_update)
         
         # Connect control panel signals
         self.control_panel.window_level_changed.connect(self.renderer.set_window_level)
-        self.control_panel.window_level_changed.connect(self.image_viewer.update_display)
+        self.control_panel.window_level_changed.connect(self.schedule_display_update)
         self.control_panel.segment_changed.connect(self.roi_manager.set_current_segment)
         self.control_panel.roi_drawing_toggled.connect(self.image_viewer.set_drawing_mode)
         self.control_panel.clear_last_roi_requested.connect(self.roi_manager.delete_last_roi)
@@ -112,7 +127,7 @@ class DicomViewerApp(QMainWindow):
 
         # Connect AI panel signals
         # self.ai_panel.model_loaded.connect(self.ai_model_manager.load_model)
-        # self.ai_panel.predict_rois_requested.connect(self.ai_model_manager.predict_rois)
+        # (prediction itself runs on the AI panel's inference worker thread)
 
 
     
@@ -120,11 +135,24 @@ class DicomViewerApp(QMainWindow):
         window = int(round(self.dicom_model.default_window))
         level = int(round(self.dicom_model.default_level))
 
+        # Drop the previous series' image first so the new window/level is
+        # only applied once, by the single redraw below
+        self.renderer.set_image_data(None)
         self.renderer.set_window_level(window, level)
         self.control_panel.update_window_level(window, level)
 
         self.image_viewer.update_display()
 
+    @pyqtSlot()
+    def schedule_display_update(self):
+        """Queue a display refresh for the next event loop tick"""
+        self._display_timer.start()
+
+    @pyqtSlot()
+    def schedule_statistics_update(self):
+        """Restart the statistics debounce so only the last slice is computed"""
+        self._stats_timer.start()
+
     @pyqtSlot()
     def show_copy_rois_dialog(self):
         """Show dialog to copy ROIs from another series"""
@@ -1,7 +1,7 @@
 from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel
-from PyQt5.QtCore import Qt, QSize, QPointF
+from PyQt5.QtCore import Qt, QSize, QPointF, QTimer
 from PyQt5.QtGui import QPainter
-from PyQt5.QtCore import pyqtSignal
+from PyQt5.QtCore import pyqtSignal, pyqtSlot
 from PyQt5.QtWidgets import QSlider
 
 import numpy as np
@@ -18,6 +18,16 @@ class ImageViewerPanel(QWidget):
         self.drawing_roi = False
         self.roi_start_pos = None
         self.roi_current_pos = None
+        self._last_rendered = None  # (series_path, slice_index) held by the renderer
+        
+        # Wheel ticks and key repeats arriving within one frame are applied
+        # as a single slice move
+        self._pending_slice_steps = 0
+        self._wheel_angle_remainder = 0  # partial wheel notches (eighths of a degree)
+        self._slice_step_timer = QTimer(self)
+        self._slice_step_timer.setSingleShot(True)
+        self._slice_step_timer.setInterval(16)
+        self._slice_step_timer.timeout.connect(self._apply_pending_slice_steps)
     
     def setup_ui(self):
         """Set up UI components for image viewing"""
@@ -87,6 +97,12 @@ class ImageViewerPanel(QWidget):
         # Enable focus to capture keyboard events
         self.image_label.setFocusPolicy(Qt.StrongFocus)
         self.image_label.keyPressEvent = self.on_key_press
+        
+        # Drag repaints are capped at about one per display frame
+        self._repaint_timer = QTimer(self)
+        self._repaint_timer.setSingleShot(True)
+        self._repaint_timer.setInterval(16)
+        self._repaint_timer.timeout.connect(self.image_label.update)
 
         self.image_label.setAlignment(Qt.AlignCenter)
         
@@ -107,11 +123,19 @@ class ImageViewerPanel(QWidget):
             # -1 because slider is 1-based but model is 0-based
             self.dicom_model.set_slice_index(value - 1)
 
-    def update_display(self):
+    @pyqtSlot()
+    def update_display(self, force=False):
         """Update the display with current slice"""
         if not self.dicom_model.current_series:
             self.image_label.setText("No image loaded")
             return
+        
+        # ROI and window/level changes only need a repaint when the renderer
+        # already holds this slice
+        key = (self.dicom_model.current_series_path, self.dicom_model.current_slice_index)
+        if not force and key == self._last_rendered and self.renderer.image is not None:
+            self.image_label.update()
+            return
             
         # Get current slice pixel data
         pixel_array = self.dicom_model.get_slice_pixel_data(self.dicom_model.current_slice_index)
@@ -121,6 +145,10 @@ class ImageViewerPanel(QWidget):
             
         # Update renderer with new image data
         self.renderer.set_image_data(pixel_array)
+        self._last_rendered = key
+        
+        # Decode the neighbouring slices while the user looks at this one
+        self.dicom_model.prefetch_slices(self.dicom_model.current_slice_index)
         
         # Update slice counter
         self.update_slice_info()
@@ -175,18 +203,19 @@ class ImageViewerPanel(QWidget):
             window = self.renderer.window
             level = self.renderer.level
             
-            # Update window/level based on mouse movement
+            # Update window/level based on mouse movement (clamped inline,
+            # this runs on every drag event)
             window += dx * 3
-            window = max(1, min(4000, window))
+            window = 1 if window < 1 else 4000 if window > 4000 else window
             
             level -= dy * 3
-            level = max(-2000, min(2000, level))
+            level = -2000 if level < -2000 else 2000 if level > 2000 else level
             
             # Update renderer
             self.renderer.set_window_level(window, level)
 
-            # Force repaint
-            self.image_label.update()
+            # Repaint at the next frame
+            self.schedule_repaint()
 
             self.window_level_changed.emit(window, level)
             
@@ -194,7 +223,12 @@ class ImageViewerPanel(QWidget):
         elif self.drawing_roi and self.roi_start_pos:
             # Update ROI preview while drawing
             self.roi_current_pos = event.pos()
-            self.image_label.update()
+            self.schedule_repaint()
+    
+    def schedule_repaint(self):
+        """Repaint the image once the current frame interval has passed"""
+        if not self._repaint_timer.isActive():
+            self._repaint_timer.start()
     
     def on_mouse_release(self, event):
         """Handle mouse release on the image"""
@@ -212,9 +246,8 @@ class ImageViewerPanel(QWidget):
             )
             
             if norm_x is not None and norm_y is not None:
-                # Calculate radius in normalized units
-                current_pt = QPointF(self.roi_current_pos)
-                distance = (current_pt - QPointF(self.roi_start_pos)).manhattanLength() / 2
+                # Calculate radius in normalized units (same radius as the preview circle)
+                distance = self.renderer.drag_radius(self.roi_start_pos, self.roi_current_pos)
                 normalized_radius = distance / min(label_size.width(), label_size.height())
                 
                 # Add ROI if it's valid
@@ -241,26 +274,21 @@ class ImageViewerPanel(QWidget):
                         if hasattr(slice_data, 'ImagePositionPatient'):
                             anat_pos = slice_data.ImagePositionPatient
 
-                        if hasattr(slice_data, 'ImageOrientationPatient'):
-                            orientation_vec = slice_data.ImageOrientationPatient
-                            orientation_vec_cross = np.cross(orientation_vec[:3], orientation_vec[3:])
-                            orientation_vec_cross_rounded = [round(abs(val), 0) for val in orientation_vec_cross]
-                            orientation = orientation_vec_cross_rounded.index(1.0) + 1
-                            if orientation == 1:
-                                # sagittal
-                                pos_LR = anat_pos[0]
-                                pos_AP = anat_pos[1] + (spacing_y * (rows * norm_y))
-                                pos_SI = anat_pos[2] + (spacing_x * (cols * (1 - norm_x)))
-                            elif orientation == 2:
-                                # coronal
-                                pos_LR = anat_pos[0] + (spacing_x * (cols * norm_x))
-                                pos_AP = anat_pos[1]
-                                pos_SI = anat_pos[2] + (spacing_y * (rows * (1 - norm_y)))
-                            elif orientation == 3:
-                                # axial
-                                pos_LR = anat_pos[0] + (spacing_x * (cols * norm_x))
-                                pos_AP = anat_pos[1] + (spacing_y * (rows * norm_y))
-                                pos_SI = anat_pos[2]
+                        # Orientation was classified once per slice when the series loaded
+                        # (1=sagittal, 2=coronal, 3=axial, 0=no ImageOrientationPatient)
+                        orientation = int(self.dicom_model.get_slice_orientations(
+                            self.dicom_model.current_series_path)[self.dicom_model.current_slice_index])
+                        if orientation:
+                            # In-plane offsets (mm) of the ROI centre from the first pixel,
+                            # and from the far edge for the axis the view shows flipped
+                            offset_x = spacing_x * cols * norm_x
+                            offset_y = spacing_y * rows * norm_y
+                            displacement = {
+                                1: (0, offset_y, spacing_x * cols - offset_x),  # sagittal
+                                2: (offset_x, 0, spacing_y * rows - offset_y),  # coronal
+                                3: (offset_x, offset_y, 0),                     # axial
+                            }[orientation]
+                            pos_LR, pos_AP, pos_SI = (np.asarray(anat_pos, dtype=np.float64) + displacement).tolist()
                         else:
                             orientation = "N/A"
                             pos_LR = "N/A"
@@ -275,20 +303,10 @@ class ImageViewerPanel(QWidget):
                         center_x_px = int(norm_x * width)
                         center_y_px = int(norm_y * height)
                         
-                        # Create a mask for the circular ROI
-                        y_indices, x_indices = np.ogrid[:height, :width]
-                        dist_from_center = np.sqrt((x_indices - center_x_px)**2 + (y_indices - center_y_px)**2)
-                        mask = dist_from_center <= radius_px
-                        
-                        # Get pixel values within the ROI
-                        roi_values = pixel_array[mask]
-                        
-                        # Calculate statistics
-                        mean_val = np.mean(roi_values)
-                        median_val = np.median(roi_values)
-                        min_val = np.min(roi_values)
-                        max_val = np.max(roi_values)
-                        size_px = len(roi_values)
+                        # Calculate statistics within the circular ROI
+                        mean_val, median_val, min_val, max_val, size_px = \
+                            self.roi_manager.calculate_roi_statistics(
+                                pixel_array, center_x_px, center_y_px, radius_px)
                         
 
                     self.roi_manager.add_roi(
@@ -312,34 +330,48 @@ class ImageViewerPanel(QWidget):
     
     def on_wheel(self, event):
         """Handle mouse wheel for slice navigation"""
-        # Calculate the number of steps (usually 1, but can be more for some mice)
-        steps = event.angleDelta().y() // 120
+        # Calculate the number of steps (usually 1, but can be more for some mice).
+        # High-resolution wheels and touchpads send fractions of a 120-unit
+        # notch, so carry the remainder instead of rounding each event
+        self._wheel_angle_remainder += event.angleDelta().y()
+        steps = int(self._wheel_angle_remainder / 120)
+        self._wheel_angle_remainder -= steps * 120
         
-        # Navigate slices based on wheel direction
-        if steps > 0:
-            for _ in range(steps):
-                self.dicom_model.previous_slice()
-        else:
-            for _ in range(-steps):
-                self.dicom_model.next_slice()
+        # Navigate slices based on wheel direction (scrolling up goes back)
+        self.queue_slice_steps(-steps)
     
     def on_key_press(self, event):
         """Handle keyboard navigation"""
         if event.key() == Qt.Key_Left or event.key() == Qt.Key_Up:
-            self.dicom_model.previous_slice()
+            self.queue_slice_steps(-1)
         elif event.key() == Qt.Key_Right or event.key() == Qt.Key_Down:
-            self.dicom_model.next_slice()
+            self.queue_slice_steps(1)
         else:
             # Pass event to parent class for default handling
             super().keyPressEvent(event)
     
+    def queue_slice_steps(self, steps):
+        """Accumulate slice steps and apply them together at the next frame"""
+        if steps == 0:
+            return
+        
+        self._pending_slice_steps += steps
+        if not self._slice_step_timer.isActive():
+            self._slice_step_timer.start()
+    
+    def _apply_pending_slice_steps(self):
+        """Move by all accumulated slice steps with a single slice_changed"""
+        steps = self._pending_slice_steps
+        self._pending_slice_steps = 0
+        self.dicom_model.advance_slices(steps)
+    
     def on_paint(self, event):
         """Custom paint event for image and ROIs"""
         # Start with standard paint event
         super().paintEvent(event)
         
         # Check if we have an image to display
-        if self.renderer.get_pixmap() is None:
+        if self.renderer.get_image() is None:
             return
             
         painter = QPainter(self.image_label)
@@ -1,15 +1,34 @@
 import os
+import numbers
 import numpy as np
 import csv
+from functools import lru_cache
 from PyQt5.QtCore import QObject, pyqtSignal
 from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, 
                             QListWidget, QListWidgetItem, QPushButton, 
                             QFileDialog, QAbstractItemView)
 from PyQt5.QtCore import Qt
-from PyQt5.QtGui import QColor
+from dicom_image_renderer import DicomImageRenderer
+
+
+@lru_cache(maxsize=64)
+def circle_mask(r, r_squared):
+    """Read-only (2r+1, 2r+1) mask of the pixels within sqrt(r_squared) of the centre"""
+    # The squared distances are integers, so comparing with floor(r^2) keeps it all int32
+    offsets = np.arange(-r, r + 1, dtype=np.int32)
+    mask = (offsets * offsets)[:, None] + offsets * offsets <= r_squared
+    mask.flags.writeable = False
+    return mask
 
 
 class ROI():
+    # Fixed attribute set: no per-instance __dict__, so ROIs are smaller and
+    # attribute reads in the paint/stats loops are slot lookups
+    __slots__ = ('segment_label', 'segment', 'slice_idx', 'center_x', 'center_y', 'radius_px',
+                 'center_LR_mm', 'center_AP_mm', 'center_SI_mm', 'orientation',
+                 'area_mm2', 'mean_val', 'median_val', 'min_val', 'max_val', 'size_px',
+                 'study_id', 'exam_number', 'series_id', 'series_uid', 'series_path')
+    
     def __init__(self, segment_label, segment, slice_idx, center_x, center_y, radius, 
                 center_LR_mm, center_AP_mm, center_SI_mm, orientation, 
                 area_mm2, mean_val, median_val, min_val, max_val, size_px, 
@@ -43,6 +62,34 @@ class ROIManager(QObject):
     # Define signals
     rois_changed = pyqtSignal()
     
+    # Extended header for ROI CSV export
+    EXPORT_HEADER = [
+        "Segment Label", "Segment Index", "Slice Index", "Center X", "Center Y", "Radius", 
+        "Center LR (mm)", "Center AP (mm)", "Center SI (mm)", "Orientation", 
+        "Area (mm2)", "Mean", "Median", "Min", "Max", "Size", 
+        "Study ID", "Exam Number", "Series ID", "Series UID", "Series Path"
+        ]
+    
+    # Numeric ROI fields available as columns: (dtype, value stored where the ROI
+    # has no number, e.g. "N/A" on a slice without ImageOrientationPatient)
+    ROI_COLUMN_TYPES = {
+        'slice_idx': (np.intp, -1),
+        'segment': (np.intp, 0),
+        'orientation': (np.int8, 0),  # 0 = unknown, as in the model's slice orientations
+        'center_LR_mm': (np.float64, np.nan),
+        'center_AP_mm': (np.float64, np.nan),
+        'center_SI_mm': (np.float64, np.nan),
+        'area_mm2': (np.float64, np.nan),
+    }
+    
+    # Per slice orientation (1=sagittal, 2=coronal, 3=axial): the anatomical axis
+    # (0=LR, 1=AP, 2=SI) along image x and whether x runs against it, then the same for y
+    PLANE_AXES = {
+        1: (2, True, 1, False),
+        2: (0, False, 2, True),
+        3: (0, False, 1, False),
+    }
+    
     def __init__(self, dicom_model):
         super().__init__()
         self.dicom_model = dicom_model
@@ -53,6 +100,9 @@ class ROIManager(QObject):
         self.current_segment = 0
         self.segmentation_scheme = "9-segment"  # Default to 9-segment scheme
         self.segment_labels = []
+        self._rois_by_slice = {}  # (series_path, slice_idx) -> tuple of ROIs on that slice
+        self._roi_by_segment = {}  # (series_path, segment) -> the ROI for that segment
+        self._roi_columns = {}  # Field name -> numpy array over self.rois, built on demand
     
     def add_roi(self, segment_label, segment, slice_idx, center_x, center_y, radius, 
                 center_LR_mm, center_AP_mm, center_SI_mm, orientation, 
@@ -60,38 +110,55 @@ class ROIManager(QObject):
                 study_id, exam_number, series_id, series_uid, series_path):
         
         """Add a new ROI"""
-        # check segments already in rois
-        # delete if already in rois
-        for i, roi in enumerate(self.rois):
-            if roi.segment == segment and roi.series_path == series_path:
-                self.delete_roi(i)
-                
         new_roi = ROI(segment_label, segment, slice_idx, center_x, center_y, radius, 
                         center_LR_mm, center_AP_mm, center_SI_mm, orientation, 
                         area_mm2, mean_val, median_val, min_val, max_val, size_px, 
                         study_id, exam_number, series_id, series_uid, series_path)
             
-        self.rois.append(new_roi)
+        self._add_roi(new_roi)
         self.rois_changed.emit()
         return True
     
+    def _add_roi(self, roi):
+        """Add an ROI without signalling, so bulk operations can emit rois_changed once"""
+        # Each segment has one ROI per series; replace any existing one
+        self._delete_segment_roi(roi.series_path, roi.segment)
+        self.rois.append(roi)
+        self._index_roi(roi)
+    
     def delete_roi(self, roi_index):
         """Delete a specific ROI"""
         if 0 <= roi_index < len(self.rois):
-            del self.rois[roi_index]
+            self._unindex_roi(self.rois.pop(roi_index))
             self.rois_changed.emit()
             return True
         return False
     
+    def _delete_segment_roi(self, series_path, segment):
+        """Delete the ROI drawn for a segment in a series, if there is one (no signal)"""
+        roi = self._roi_by_segment.get((series_path, segment))
+        if roi is None:
+            return False
+        
+        # ROIs compare by identity, so remove() drops this exact ROI
+        self.rois.remove(roi)
+        self._unindex_roi(roi)
+        return True
+    
     def delete_roi_duplicates(self):
         """Delete duplicate ROIs"""
+        # One pass with a set of identifying fields, keeping the first occurrence
+        seen = set()
         unique_rois = []
         for roi in self.rois:
-            if roi not in unique_rois:
+            key = (roi.segment, roi.series_path, roi.slice_idx, roi.center_x, roi.center_y, roi.radius_px)
+            if key not in seen:
+                seen.add(key)
                 unique_rois.append(roi)
         
         if len(unique_rois) < len(self.rois):
             self.rois = unique_rois
+            self._rebuild_roi_index()
             self.rois_changed.emit()
             return True
         
@@ -99,33 +166,35 @@ class ROIManager(QObject):
     
     def delete_last_roi(self):
         """Remove the last drawn ROI on the current slice"""
-        current_slice = self.dicom_model.current_slice_index
-        
-        # Find ROIs for the current slice
-        current_slice_rois = [(i, roi) for i, roi in enumerate(self.rois) 
-                             if roi.slice_idx == current_slice]
-        
-        if current_slice_rois:
-            # Remove the last ROI for the current slice
-            idx, _ = current_slice_rois[-1]
-            return self.delete_roi(idx)
+        # The per-slice index keeps ROIs in the order they were added, so the
+        # last one is the most recent; only the displayed series is considered
+        slice_rois = self.get_rois_for_slice(self.dicom_model.current_slice_index,
+                                             self.dicom_model.current_series_path)
+        if not slice_rois:
+            return False
         
-        return False
+        # ROIs compare by identity, so index() finds this exact ROI
+        return self.delete_roi(self.rois.index(slice_rois[-1]))
     
     def clear_slice_rois(self, slice_idx):
         """Clear all ROIs for a specific slice"""
-        to_delete = [i for i, roi in enumerate(self.rois) if roi.slice_idx == slice_idx]
-        
-        # Delete from last to first to avoid index issues
-        for idx in sorted(to_delete, reverse=True):
-            self.delete_roi(idx)
+        # Compact the list in one pass instead of deleting (and signalling) one by one
+        kept_rois = [roi for roi in self.rois if roi.slice_idx != slice_idx]
+        if len(kept_rois) == len(self.rois):
+            return False
         
-        return len(to_delete) > 0
+        self.rois = kept_rois
+        self._rebuild_roi_index()
+        self.rois_changed.emit()
+        return True
     
     def clear_all_rois(self):
         """Clear all ROIs"""
         if self.rois:
             self.rois = []
+            self._rois_by_slice = {}
+            self._roi_by_segment = {}
+            self._roi_columns = {}
             self.rois_changed.emit()
             return True
         return False
@@ -143,8 +212,61 @@ class ROIManager(QObject):
         return False
     
     def get_rois_for_slice(self, slice_idx, series_path=None):
-        """Get ROIs for a specific slice"""
-        return [roi for roi in self.rois if roi.slice_idx == slice_idx and roi.series_path == series_path]
+        """Get ROIs for a specific slice (a shared, immutable tuple)"""
+        return self._rois_by_slice.get((series_path, slice_idx), ())
+    
+    def _index_roi(self, roi):
+        """Add an ROI to the per-slice and per-segment lookups"""
+        # Tuples are replaced rather than mutated, so callers can hold on to them
+        key = (roi.series_path, roi.slice_idx)
+        self._rois_by_slice[key] = self._rois_by_slice.get(key, ()) + (roi,)
+        self._roi_by_segment[(roi.series_path, roi.segment)] = roi
+        self._roi_columns = {}
+    
+    def _unindex_roi(self, roi):
+        """Remove an ROI from the per-slice and per-segment lookups"""
+        self._roi_columns = {}
+        segment_key = (roi.series_path, roi.segment)
+        if self._roi_by_segment.get(segment_key) is roi:
+            del self._roi_by_segment[segment_key]
+        
+        key = (roi.series_path, roi.slice_idx)
+        slice_rois = self._rois_by_slice.get(key)
+        if slice_rois is None:
+            return
+        
+        # Match by identity (ROIs don't define equality)
+        slice_rois = tuple(slice_roi for slice_roi in slice_rois if slice_roi is not roi)
+        if slice_rois:
+            self._rois_by_slice[key] = slice_rois
+        else:
+            del self._rois_by_slice[key]
+    
+    def _rebuild_roi_index(self):
+        """Rebuild the ROI lookups after self.rois is replaced wholesale"""
+        self._rois_by_slice = {}
+        self._roi_by_segment = {}
+        self._roi_columns = {}
+        for roi in self.rois:
+            self._index_roi(roi)
+    
+    def _get_roi_columns(self, *fields):
+        """Return the requested fields of self.rois as parallel numpy arrays, rebuilt after any change"""
+        columns = self._roi_columns
+        for field in fields:
+            if field in columns:
+                continue
+            if field == 'roi':
+                column = np.empty(len(self.rois), dtype=object)
+                column[:] = self.rois
+            elif field in self.ROI_COLUMN_TYPES:
+                dtype, missing = self.ROI_COLUMN_TYPES[field]
+                column = np.array([value if isinstance(value, numbers.Real) else missing
+                                   for value in (getattr(roi, field) for roi in self.rois)], dtype=dtype)
+            else:
+                column = np.array([getattr(roi, field) for roi in self.rois], dtype=object)
+            columns[field] = column
+        return {field: columns[field] for field in fields}
     
     def export_rois(self, filename=None):
         """Export ROIs to a CSV file"""
@@ -166,48 +288,45 @@ class ROIManager(QObject):
             filename += '.csv'
         
         try:
-            with open(filename, 'w', newline='') as f:
+            # Rows are formatted as writerows consumes them, so only the file
+            # buffer (1 MiB, written in one or a few calls) is held in memory
+            with open(filename, 'w', newline='', buffering=1 << 20) as f:
                 writer = csv.writer(f)
-                # Write extended header
-                writer.writerow([
-                    "Segment Label", "Segment Index", "Slice Index", "Center X", "Center Y", "Radius", 
-                    "Center LR (mm)", "Center AP (mm)", "Center SI (mm)", "Orientation", 
-                    "Area (mm2)", "Mean", "Median", "Min", "Max", "Size", 
-                    "Study ID", "Exam Number", "Series ID", "Series UID", "Series Path"
-                    ])
-                
-                # Write ROI data
-                for idx, roi in enumerate(self.rois):
-                    writer.writerow([
-                        roi.segment_label,
-                        str(roi.segment), 
-                        str(roi.slice_idx+1), 
-                        f"{roi.center_x:.4f}", 
-                        f"{roi.center_y:.4f}", 
-                        f"{roi.radius_px:.4f}",
-                        f"{roi.center_LR_mm:.4f}",
-                        f"{roi.center_AP_mm:.4f}",
-                        f"{roi.center_SI_mm:.4f}",
-                        f"{roi.orientation}",
-                        f"{roi.area_mm2:.4f}",
-                        f"{roi.mean_val:.4f}",
-                        f"{roi.median_val:.4f}",
-                        f"{roi.min_val:.4f}",
-                        f"{roi.max_val:.4f}",
-                        str(roi.size_px),
-                        roi.study_id,
-                        roi.exam_number,
-                        roi.series_id,
-                        roi.series_uid,
-                        roi.series_path
-                    ])
-                        
+                writer.writerow(self.EXPORT_HEADER)
+                writer.writerows(self._iter_export_rows())
                 
             return True
         except Exception as e:
             print(f"Error exporting ROIs: {e}")
             return False
         
+    def _iter_export_rows(self):
+        """Yield the formatted CSV row for each ROI, in list order"""
+        for roi in self.rois:
+            yield [
+                roi.segment_label,
+                str(roi.segment), 
+                str(roi.slice_idx+1), 
+                f"{roi.center_x:.4f}", 
+                f"{roi.center_y:.4f}", 
+                f"{roi.radius_px:.4f}",
+                f"{roi.center_LR_mm:.4f}",
+                f"{roi.center_AP_mm:.4f}",
+                f"{roi.center_SI_mm:.4f}",
+                f"{roi.orientation}",
+                f"{roi.area_mm2:.4f}",
+                f"{roi.mean_val:.4f}",
+                f"{roi.median_val:.4f}",
+                f"{roi.min_val:.4f}",
+                f"{roi.max_val:.4f}",
+                str(roi.size_px),
+                roi.study_id,
+                roi.exam_number,
+                roi.series_id,
+                roi.series_uid,
+                roi.series_path
+            ]
+    
     def import_rois(self, filename=None):
         """Import ROIs from a CSV file"""
         if filename is None:
@@ -227,11 +346,7 @@ class ROIManager(QObject):
                 header = next(reader)
                 
                 # Check file format
-                required_fields = ["Segment Label", "Segment Index", "Slice Index", "Center X", "Center Y", "Radius", 
-                    "Center LR (mm)", "Center AP (mm)", "Center SI (mm)", "Orientation", 
-                    "Area (mm2)", "Mean", "Median", "Min", "Max", "Size", 
-                    "Study ID", "Exam Number", "Series ID", "Series UID", "Series Path"
-                    ]
+                required_fields = self.EXPORT_HEADER
                 
                 # Verify all required fields are present (allowing for case differences)
                 header_lower = [h.lower() for h in header]
@@ -240,78 +355,48 @@ class ROIManager(QObject):
                         print(f"Error: Required field '{field}' missing in CSV header")
                         return False
                 
-                # Get indices of required fields
+                # Column index and parser for each ROI constructor argument, in order
+                parsers = [(header_lower.index(field.lower()), parse) for field, parse in zip(required_fields, (
+                    str, int, lambda v: int(v) - 1, float, float, float,
+                    float, float, float, int,
+                    float, float, float, float, float, int,
+                    str, str, str, str, str))]
                 segment_label_col = header_lower.index("segment label")
-                segment_col = header_lower.index("segment index")
-                slice_idx_col = header_lower.index("slice index")
-                center_x_col = header_lower.index("center x")
-                center_y_col = header_lower.index("center y")
-                radius_col = header_lower.index("radius")
-                anat_x_col = header_lower.index("center lr (mm)")
-                anat_y_col = header_lower.index("center ap (mm)")
-                anat_z_col = header_lower.index("center si (mm)")
-                orientation_col = header_lower.index("orientation")
-                area_col = header_lower.index("area (mm2)")
-                mean_col = header_lower.index("mean")
-                median_col = header_lower.index("median")
-                min_col = header_lower.index("min")
-                max_col = header_lower.index("max")
-                size_col = header_lower.index("size")
-                study_id_col = header_lower.index("study id")
-                exam_number_col = header_lower.index("exam number")
-                series_id_col = header_lower.index("series id")
                 series_uid_col = header_lower.index("series uid")
-                series_col = header_lower.index("series path")
+                current_series_uid = self.dicom_model.current_series_uid
+                segment_labels = set(self.segment_labels)
                 
                 # Clear existing ROIs if any
                 self.clear_all_rois()
                 
-                # Read ROI data
+                # Read ROI data, keeping the last row for each (series, segment) like add_roi does
+                imported_rois = {}
                 for i, row in enumerate(reader):
                     try:
-                        if row[series_uid_col] != self.dicom_model.current_series_uid:
+                        # Check the cheap string columns before parsing the row
+                        if row[series_uid_col] != current_series_uid:
                             print(f"skipping row {i+1} because series path does not match current series")
                             continue
                         
-                        if row[segment_label_col] not in self.segment_labels:
+                        if row[segment_label_col] not in segment_labels:
                             print(f"can't find correct segment labels for row {i+1}. maybe change segmentation scheme?")
                             continue
 
-                        # Extract required fields
-                        slice_idx = int(row[slice_idx_col])-1
-                        center_x = float(row[center_x_col])
-                        center_y = float(row[center_y_col])
-                        radius = float(row[radius_col])
-                        segment = int(row[segment_col])
-                        segment_label = row[segment_label_col]
-                        center_LR_mm = float(row[anat_x_col])
-                        center_AP_mm = float(row[anat_y_col])
-                        center_SI_mm = float(row[anat_z_col])
-                        orientation = int(row[orientation_col])
-                        area_mm2 = float(row[area_col])
-                        mean_val = float(row[mean_col])
-                        median_val = float(row[median_col])
-                        min_val = float(row[min_col])
-                        max_val = float(row[max_col])
-                        size_px = int(row[size_col])
-                        study_id = row[study_id_col]
-                        exam_number = row[exam_number_col]
-                        series_id = row[series_id_col]
-                        series_uid = row[series_uid_col]
-                        series_path = row[series_col]
-
-                        # Add the ROI
-                        self.add_roi(segment_label, segment, slice_idx, center_x, center_y, radius, 
-                                     center_LR_mm, center_AP_mm, center_SI_mm, orientation, area_mm2, 
-                                     mean_val, median_val, min_val, max_val, size_px, 
-                                     study_id, exam_number, series_id, series_uid, series_path)
+                        roi = ROI(*[parse(row[col]) for col, parse in parsers])
                                                
                     except (ValueError, IndexError) as e:
                         print(f"Error parsing ROI row {i+1}: {e}")
                         # Continue with next row
+                        continue
+                    
+                    # A replaced ROI moves to the end, as if it had been deleted and re-added
+                    key = (roi.series_path, roi.segment)
+                    imported_rois.pop(key, None)
+                    imported_rois[key] = roi
                 
-               
-                self.delete_roi_duplicates()
+                self.rois = list(imported_rois.values())
+                # Keyed by (series, segment) above, so there are no duplicates to sweep
+                self._rebuild_roi_index()
 
                 # Notify of changes
                 self.rois_changed.emit()
@@ -353,21 +438,15 @@ class ROIManager(QObject):
         
         # Populate list with available series
         # for series_path in anatomical_positions.keys():
-        series_paths_with_rois = []
-        
-        for roi in self.rois:
-            if roi.series_path in series_paths_with_rois:
-                continue
-            
-            series_paths_with_rois.append(roi.series_path)
+        series_paths_with_rois = {roi.series_path for roi in self.rois}
         
         for series_path in sorted(series_paths_with_rois):
             # Skip current series
             if series_path == current_series_path:
                 continue
                 
-            # Get series name from path
-            path_parts = series_path.split(os.sep)
+            # Get series name from path (only the last three components are needed)
+            path_parts = os.path.normpath(series_path).rsplit(os.sep, 3)
             if len(path_parts) >= 3:
                 series_name = f"{path_parts[-3]} > {path_parts[-2]} > {path_parts[-1]}"
             else:
@@ -426,121 +505,129 @@ class ROIManager(QObject):
         if not source_series_path or not target_series_path:
             return False
         
-        # Get source and target positions
-        source_positions = anatomical_positions.get(source_series_path, {})
-        target_positions = anatomical_positions.get(target_series_path, {})
+        # Get source and target positions ((N, 3) arrays indexed by slice)
+        source_positions = anatomical_positions.get(source_series_path)
+        target_positions = anatomical_positions.get(target_series_path)
 
         target_orientations = self.dicom_model.get_slice_orientations(target_series_path)
         
-        if not source_positions or not target_positions:
+        if source_positions is None or target_positions is None:
             return False
         
         # Get ROIs from source series
         # source_rois = [roi for roi in self.rois if roi[1] in source_positions and roi[-1] == source_series_path]
-        source_rois = [roi for roi in self.rois if roi.series_path == source_series_path]
+        columns = self._get_roi_columns('roi', 'series_path', 'slice_idx', 'orientation',
+                                        'center_LR_mm', 'center_AP_mm', 'center_SI_mm', 'area_mm2')
+        source_mask = columns['series_path'] == source_series_path
+        source_rois = columns['roi'][source_mask]
         
-        if not source_rois:
+        if not source_rois.size:
             return False
                 
 
         
-        # Create a mapping from source to target slices based on closest anatomical positions
-        slice_mapping = {}
-        source_to_xyz = {}  # Store anatomical coordinates for each source slice
-        
-        for source_idx, source_pos in source_positions.items():
-                
-            source_to_xyz[source_idx] = source_pos
-                        
-            # Find closest target slice 
-            best_target_idx = None
-            best_distance = float('inf')
+        # Per orientation, sort the target slices by their coordinate along the
+        # slice normal (1=LR, 2=AP, 3=SI) so the nearest one is a binary search away
+        target_axes = {}
+        for orientation in np.unique(target_orientations):
+            if not orientation:
+                # Unknown orientation (no ImageOrientationPatient)
+                continue
+            target_ids = np.flatnonzero(target_orientations == orientation)
+            coords = target_positions[target_ids, orientation - 1]
+            order = np.argsort(coords, kind='stable')
+            target_axes[orientation] = (coords[order], target_ids[order])
+        
+        # Create a mapping from source to target slices based on closest anatomical
+        # positions, matching all source slices at once per orientation
+        num_source = len(source_positions)
+        best_distance = np.full(num_source, np.inf)
+        best_target = np.full(num_source, -1, dtype=np.intp)
+        
+        for orientation, (coords, target_ids) in target_axes.items():
+            positions = source_positions[:, orientation - 1]
+            upper = np.searchsorted(coords, positions)
+            # First slice of any run sharing the coordinate just below
+            lower = np.searchsorted(coords, coords[np.maximum(upper - 1, 0)])
             
-            for target_idx, target_pos in target_positions.items():
-                orientation = target_orientations[target_idx]
-
-                if orientation == 1:
-                    distance = abs(source_pos[0] - target_pos[0])
-                elif orientation == 2:
-                    distance = abs(source_pos[1] - target_pos[1])
-                elif orientation == 3:
-                    distance = abs(source_pos[2] - target_pos[2])
-                    
-               
+            for candidate, valid in ((upper, upper < len(coords)), (lower, upper > 0)):
+                candidate = np.minimum(candidate, len(coords) - 1)
+                distance = np.abs(positions - coords[candidate])
+                candidate_ids = target_ids[candidate]
                 
-                # Only consider if within maximum distance threshold
-                if distance <= max_distance_mm and distance < best_distance:
-                    best_distance = distance
-                    best_target_idx = target_idx
-            
-            if best_target_idx is not None:
-                slice_mapping[source_idx] = (best_target_idx, best_distance, target_orientations[best_target_idx])
-        
-        # Copy ROIs to target series
+                # Only consider if within maximum distance threshold; ties go to the lowest index
+                better = valid & (distance <= max_distance_mm) & (
+                    (distance < best_distance) | ((distance == best_distance) & (candidate_ids < best_target)))
+                best_distance = np.where(better, distance, best_distance)
+                best_target = np.where(better, candidate_ids, best_target)
+        
+        # Target slice for every source ROI (-1 where its slice has no match)
+        source_slices = columns['slice_idx'][source_mask]
+        in_range = (source_slices >= 0) & (source_slices < num_source)
+        roi_targets = np.where(in_range, best_target[np.where(in_range, source_slices, 0)], -1)
+        
+        # Only ROIs whose orientation matches the target slice and whose label
+        # is in the current scheme are copied
+        segment_labels = set(self.segment_labels)
+        copyable = roi_targets >= 0
+        copyable[copyable] = (target_orientations[roi_targets[copyable]]
+                              == columns['orientation'][source_mask][copyable])
+        copyable &= np.fromiter((roi.segment_label in segment_labels for roi in source_rois),
+                                dtype=bool, count=len(source_rois))
+        
+        # Copy ROIs to target series, grouped by target slice (in ROI order within
+        # a slice) so each slice's header and pixel data are fetched once
         new_rois = []
+        copy_order = np.flatnonzero(copyable)
+        copy_order = copy_order[np.argsort(roi_targets[copy_order], kind='stable')]
+        group_starts = np.flatnonzero(np.diff(roi_targets[copy_order])) + 1
+        source_mm = np.stack([columns['center_LR_mm'], columns['center_AP_mm'],
+                              columns['center_SI_mm']], axis=1)[source_mask]
+        source_area_mm2 = columns['area_mm2'][source_mask]
 
-        for roi in source_rois:
+        for group in np.split(copy_order, group_starts) if copy_order.size else ():
+            target_slice_idx = int(roi_targets[group[0]])
+            slice_rois = source_rois[group]
+            target_orientation = target_orientations[target_slice_idx]
+            target_slice_data = self.dicom_model.get_slice(target_slice_idx)
+            target_pixel_array = self.dicom_model.get_slice_pixel_data(target_slice_idx)
             
-            if roi.slice_idx in slice_mapping:
-                target_slice_idx, distance, target_orientation = slice_mapping[roi.slice_idx]
-
-                if target_orientation != roi.orientation:
-                    continue
-
-                if roi.segment_label not in self.segment_labels:
-                    continue
-
-                # convert center_LR_mm, center_AP_mm, center_SI_mm to pixel coordinates
-                target_slice_data = self.dicom_model.get_slice(target_slice_idx)
-                target_pixel_array = self.dicom_model.get_slice_pixel_data(target_slice_idx)
-
-                pixel_spacing = getattr(target_slice_data, 'PixelSpacing', [1, 1])
-                rows = getattr(target_slice_data, 'Rows', 1)
-                cols = getattr(target_slice_data, 'Columns', 1)
-                spacing_x, spacing_y = float(pixel_spacing[1]), float(pixel_spacing[0])
-                if target_orientation == 1:
-                    # sagittal
-                    target_center_x = 1 - (roi.center_SI_mm - target_slice_data.ImagePositionPatient[2]) / spacing_x / cols
-                    target_center_y = (roi.center_AP_mm - target_slice_data.ImagePositionPatient[1]) / spacing_y / rows
-                elif target_orientation == 2:
-                    # coronal
-                    target_center_x = (roi.center_LR_mm - target_slice_data.ImagePositionPatient[0]) / spacing_x / cols
-                    target_center_y = 1 - (roi.center_SI_mm - target_slice_data.ImagePositionPatient[2]) / spacing_y / rows
-                elif target_orientation == 3:
-                    # axial
-                    target_center_x = (roi.center_LR_mm - target_slice_data.ImagePositionPatient[0]) / spacing_x / cols
-                    target_center_y = (roi.center_AP_mm - target_slice_data.ImagePositionPatient[1]) / spacing_y / rows
-
-                # get radius from area_mm2 to pixel radius
-                radius_mm = np.sqrt(roi.area_mm2 / np.pi)
-
-                # convert radius (mm) to pixel radius then convert to proportion of image size
-                target_radius = radius_mm / spacing_x / cols
-                
-                height, width = target_pixel_array.shape
-                target_center_x_px = int(target_center_x * width)
-                target_center_y_px = int(target_center_y * height)
-                
-                # Create a mask for the circular ROI
-                target_y_indices, target_x_indices = np.ogrid[:height, :width]
-                dist_from_center = np.sqrt((target_x_indices - target_center_x_px)**2 + (target_y_indices - target_center_y_px)**2)
-                mask = dist_from_center <= (target_radius * min(cols, rows))
-                
-                # Get pixel values within the ROI
-                roi_values = target_pixel_array[mask]
-                    
-                # Calculate statistics
-                target_mean_val = np.mean(roi_values)
-                target_median_val = np.median(roi_values)
-                target_min_val = np.min(roi_values)
-                target_max_val = np.max(roi_values)
-                target_size_px = len(roi_values)
-
-
+            # Slice geometry shared by every ROI mapped onto this slice
+            pixel_spacing = getattr(target_slice_data, 'PixelSpacing', [1, 1])
+            rows = getattr(target_slice_data, 'Rows', 1)
+            cols = getattr(target_slice_data, 'Columns', 1)
+            spacing_x, spacing_y = float(pixel_spacing[1]), float(pixel_spacing[0])
+            origin = np.array(target_slice_data.ImagePositionPatient, dtype=np.float64)
+            height, width = target_pixel_array.shape
+            
+            # convert center_LR_mm, center_AP_mm, center_SI_mm to pixel coordinates for the whole group
+            offsets_mm = source_mm[group] - origin
+            x_axis, flip_x, y_axis, flip_y = self.PLANE_AXES[target_orientation]
+            target_center_x = offsets_mm[:, x_axis] / spacing_x / cols
+            target_center_y = offsets_mm[:, y_axis] / spacing_y / rows
+            if flip_x:
+                target_center_x = 1 - target_center_x
+            if flip_y:
+                target_center_y = 1 - target_center_y
 
+            # get radius from area_mm2 to pixel radius, then convert to proportion of image size
+            radius_mm = np.sqrt(source_area_mm2[group] / np.pi)
+            target_radius = radius_mm / spacing_x / cols
+            
+            target_center_x_px = (target_center_x * width).astype(np.intp)
+            target_center_y_px = (target_center_y * height).astype(np.intp)
+            radius_px = target_radius * min(cols, rows)
+            
+            for roi, center_x, center_y, radius, center_x_px, center_y_px, roi_radius_px in zip(
+                    slice_rois, target_center_x.tolist(), target_center_y.tolist(), target_radius.tolist(),
+                    target_center_x_px.tolist(), target_center_y_px.tolist(), radius_px.tolist()):
+                # Calculate statistics within the circular ROI
+                (target_mean_val, target_median_val, target_min_val,
+                 target_max_val, target_size_px) = self.calculate_roi_statistics(
+                    target_pixel_array, center_x_px, center_y_px, roi_radius_px)
 
                 # Copy ROI to target series
-                new_roi = ROI(roi.segment_label, roi.segment, target_slice_idx, target_center_x, target_center_y, target_radius, 
+                new_roi = ROI(roi.segment_label, roi.segment, target_slice_idx, center_x, center_y, radius, 
                                 roi.center_LR_mm, roi.center_AP_mm, roi.center_SI_mm, target_orientation, 
                                 roi.area_mm2, target_mean_val, target_median_val, target_min_val, target_max_val, target_size_px, 
                                 self.dicom_model.current_study_name, self.dicom_model.current_exam_number, 
@@ -548,36 +635,57 @@ class ROIManager(QObject):
 
                 new_rois.append(new_roi)
         
-        # Add new ROIs to current list
+        # Add new ROIs to current list, replacing any ROI with the same segment
+        # already in the target series (one rois_changed for the whole batch)
         for new_roi in new_rois:
-            # First check if an ROI with same segment already exists in target series
-            for i, roi in enumerate(self.rois):
-                if roi.segment == new_roi.segment and roi.series_path == target_series_path:
-                    self.delete_roi(i)
-                    break
-            
-            # Add the new ROI
-            self.rois.append(new_roi)
+            self._add_roi(new_roi)
         
-
-        self.delete_roi_duplicates()
+        # _add_roi keeps one ROI per (series, segment), so no duplicate sweep is needed
 
         # Update display
         self.rois_changed.emit()
         
         return len(new_rois) > 0
         
+    def calculate_roi_statistics(self, pixel_array, center_x_px, center_y_px, radius_px):
+        """Return (mean, median, min, max, size) of the pixels inside a circular ROI"""
+        height, width = pixel_array.shape
+        
+        # Only the ROI's bounding box can contain pixels inside the circle
+        r = int(radius_px)
+        x0, x1 = max(0, center_x_px - r), min(width, center_x_px + r + 1)
+        y0, y1 = max(0, center_y_px - r), min(height, center_y_px + r + 1)
+        if x0 >= x1 or y0 >= y1:
+            # Circle lies entirely outside the image (e.g. an ROI copied off the edge)
+            return np.nan, np.nan, np.nan, np.nan, 0
+        
+        # Circle mask over the crop: a view into the cached full-disc template,
+        # trimmed where the bounding box was clipped at the image edge
+        mask = circle_mask(r, int(radius_px * radius_px))[
+            y0 - center_y_px + r:y1 - center_y_px + r,
+            x0 - center_x_px + r:x1 - center_x_px + r]
+        
+        # Get pixel values within the ROI (a fresh copy, so it can be partitioned in place)
+        roi_values = pixel_array[y0:y1, x0:x1][mask]
+        size_px = roi_values.size
+        if size_px == 0:
+            # The box overlaps the image but the disc itself does not (e.g. a centre just off a corner)
+            return np.nan, np.nan, np.nan, np.nan, 0
+        
+        # One O(N) partial selection puts the min, max and middle element(s)
+        # where a full sort would, without sorting everything else
+        lo, hi = (size_px - 1) // 2, size_px // 2
+        roi_values.partition(sorted({0, lo, hi, size_px - 1}))
+        
+        # Calculate statistics (the mean accumulates in float64 whatever the pixel dtype)
+        mean_val = np.add.reduce(roi_values, dtype=np.float64) / size_px
+        median_val = roi_values[lo:hi + 1].mean()
+        min_val = roi_values[0]
+        max_val = roi_values[-1]
+        
+        return mean_val, median_val, min_val, max_val, size_px
+        
     def get_segment_color(self, segment):
         """Get color based on liver segment"""
-        colors = {
-            1: QColor(255, 0, 0, 128),    # Red
-            2: QColor(0, 255, 0, 128),    # Green
-            3: QColor(0, 0, 255, 128),    # Blue
-            4: QColor(255, 255, 0, 128),  # Yellow
-            5: QColor(255, 0, 255, 128),  # Magenta
-            6: QColor(0, 255, 255, 128),  # Cyan
-            7: QColor(255, 128, 0, 128),  # Orange
-            8: QColor(128, 0, 255, 128),  # Purple
-            9: QColor(0, 128, 128, 128),  # Teal
-        }
-        return colors.get(segment, QColor(255, 255, 255, 128))
\ No newline at end of file
+        # Shares the renderer's class-level table instead of building QColors per call
+        return DicomImageRenderer.SEGMENT_COLORS.get(segment, DicomImageRenderer.DEFAULT_SEGMENT_COLOR)
\ No newline at end of file
@@ -1,4 +1,4 @@
-import os
+import bisect
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QPushButton, QTreeWidget, 
                            QTreeWidgetItem, QFileDialog)
 from PyQt5.QtCore import Qt, pyqtSignal
@@ -14,6 +14,8 @@ class SeriesNavigatorPanel(QWidget):
         super().__init__(parent)
         self.dicom_model = dicom_model
         self.root_dir = None
+        self._tree_items = {}  # Tuple of tree keys -> QTreeWidgetItem
+        self._child_names = {}  # Tuple of parent keys -> its children's names, sorted
         
     def setup_ui(self):
         """Set up UI components for series navigation"""
@@ -41,55 +43,90 @@ class SeriesNavigatorPanel(QWidget):
         if not self.root_dir:
             return
             
-        self.dicom_model.load_directory(self.root_dir)
-        self.update_tree()
+        # Scan in the background; series appear as the model reports them
+        self.series_tree.clear()
+        self._tree_items = {}
+        self._child_names = {}
+        self.dicom_model.load_directory_async(self.root_dir)
+    
+    def add_series_entries(self, entries):
+        """Insert newly found series into the tree without rebuilding it"""
+        # Repaint once for the whole chunk rather than per inserted item
+        self.series_tree.setUpdatesEnabled(False)
+        try:
+            for keys, series_path in entries:
+                parent_item = None
+                for depth, name in enumerate(keys):
+                    item_key = tuple(keys[:depth + 1])
+                    item = self._tree_items.get(item_key)
+                    if item is None:
+                        # Insert at the item's sorted position among its siblings, using the
+                        # same plain string order as the model's sorted directory tree
+                        sibling_names = self._child_names.setdefault(item_key[:-1], [])
+                        row = bisect.bisect(sibling_names, name)
+                        sibling_names.insert(row, name)
+                        item = QTreeWidgetItem([name])
+                        if parent_item is None:
+                            self.series_tree.insertTopLevelItem(row, item)
+                            # Expand first level (only takes effect once the item is in the tree)
+                            item.setExpanded(True)
+                        else:
+                            parent_item.insertChild(row, item)
+                        self._tree_items[item_key] = item
+                    parent_item = item
+                
+                parent_item.setData(0, Qt.UserRole, series_path)  # Store full path
+        finally:
+            self.series_tree.setUpdatesEnabled(True)
     
     def update_tree(self):
         """Update the series tree based on model data"""
-        self.series_tree.clear()
-        
-        # Get directory structure from model
-        directory_structure = self.dicom_model.get_directory_structure()
-        
-        # Get sorted top-level keys
-        sorted_top_level = sorted(directory_structure.keys())
-        
-        # Populate tree with the hierarchical structure
-        for top_level in sorted_top_level:
-            top_item = QTreeWidgetItem(self.series_tree, [top_level])
-            self._add_tree_items(top_item, directory_structure[top_level])
-        
-        # Expand first level
-        self.series_tree.expandToDepth(0)
+        # Rebuild with painting suspended so the view lays out and repaints once
+        self.series_tree.setUpdatesEnabled(False)
+        try:
+            self.series_tree.clear()
+            self._tree_items = {}
+            self._child_names = {}
+            
+            # Get directory structure from model (already in alphabetical order at every level)
+            directory_structure = self.dicom_model.get_directory_structure()
+            
+            # Populate tree with the hierarchical structure, attaching the top level in one call
+            top_items = []
+            for top_level, content in directory_structure.items():
+                top_item = QTreeWidgetItem([top_level])
+                self._add_tree_items(top_item, content)
+                top_items.append(top_item)
+            self.series_tree.addTopLevelItems(top_items)
+            
+            # Expand first level
+            self.series_tree.expandToDepth(0)
+        finally:
+            self.series_tree.setUpdatesEnabled(True)
         
     def _add_tree_items(self, parent_item, structure):
-        """Recursively add items to the tree in alphabetical order"""
-        # Get sorted keys
-        sorted_keys = sorted(structure.keys())
-        
-        for name in sorted_keys:
-            content = structure[name]
+        """Recursively add items to the tree (the model keeps each level sorted)"""
+        # Build each level's items unparented, then attach them with one addChildren call
+        children = []
+        for name, content in structure.items():
+            child_item = QTreeWidgetItem([name])
             if isinstance(content, dict):
                 # This is an intermediate directory
-                child_item = QTreeWidgetItem(parent_item, [name])
                 self._add_tree_items(child_item, content)
             else:
                 # This is a series directory with DICOM files
-                child_item = QTreeWidgetItem(parent_item, [name])
                 child_item.setData(0, Qt.UserRole, content)  # Store full path
+            children.append(child_item)
+        
+        parent_item.addChildren(children)
     
     def on_series_selected(self, item, column):
         """Handle series selection in the tree"""
-        # Get the series path from the tree item
+        # Get the series path from the tree item; only directories the scan
+        # found DICOM files in carry one, so no filesystem check is needed here
+        # (load_series still rejects a directory that has since been emptied)
         series_path = item.data(0, Qt.UserRole)
-        if not series_path:
-            return
-        
-        # Check if this item has DICOM files directly
-        dicom_files = [f for f in os.listdir(series_path) 
-                    if f.endswith('.dcm') or f.endswith('.DCM')]
-        
-        if dicom_files:
+        if series_path:
             # Emit signal with selected series path
             self.series_selected.emit(series_path)
     
@@ -1,65 +1,165 @@
-from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QTableWidget, QTableWidgetItem,
+from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QTableView, QAbstractItemView,
                            QPushButton, QDialog, QFileDialog, QHBoxLayout)
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex
 import csv
 from PyQt5.QtGui import QKeySequence
 
+# (header, cell formatter) for the per-slice summary table
+SUMMARY_COLUMNS = [
+    ("Segment", lambda roi: roi.segment_label),
+    ("Mean", lambda roi: f"{roi.mean_val:.2f}"),
+    ("Median", lambda roi: f"{roi.median_val:.2f}"),
+    ("Min", lambda roi: f"{roi.min_val:.2f}"),
+    ("Max", lambda roi: f"{roi.max_val:.2f}"),
+]
+
+# (header, cell formatter) for the detailed statistics window
+DETAIL_COLUMNS = [
+    ("Segment Label", lambda roi: roi.segment_label),
+    ("Segment Index", lambda roi: str(roi.segment)),
+    ("Slice Index", lambda roi: str(roi.slice_idx+1)),
+    ("Center X", lambda roi: f"{roi.center_x:.4f}"),
+    ("Center Y", lambda roi: f"{roi.center_y:.4f}"),
+    ("Radius", lambda roi: f"{roi.radius_px:.4f}"),
+    ("Center LR (mm)", lambda roi: f"{roi.center_LR_mm:.4f}"),
+    ("Center AP (mm)", lambda roi: f"{roi.center_AP_mm:.4f}"),
+    ("Center SI (mm)", lambda roi: f"{roi.center_SI_mm:.4f}"),
+    ("Orientation", lambda roi: f"{roi.orientation}"),
+    ("Area (mm2)", lambda roi: f"{roi.area_mm2:.2f}"),
+    ("Mean", lambda roi: f"{roi.mean_val:.2f}"),
+    ("Median", lambda roi: f"{roi.median_val:.2f}"),
+    ("Min", lambda roi: f"{roi.min_val:.2f}"),
+    ("Max", lambda roi: f"{roi.max_val:.2f}"),
+    ("Size", lambda roi: str(roi.size_px)),
+    ("Study ID", lambda roi: roi.study_id),
+    ("Exam Number", lambda roi: roi.exam_number),
+    ("Series ID", lambda roi: roi.series_id),
+    ("Series Path", lambda roi: roi.series_path),
+]
+
+
+class RoiTableModel(QAbstractTableModel):
+    """Read-only table of ROIs; cells are only formatted when the view asks for them"""
+    
+    def __init__(self, columns, rois=(), parent=None, fetch_batch=None):
+        super().__init__(parent)
+        self.columns = columns  # List of (header, cell formatter)
+        self.fetch_batch = fetch_batch  # Rows handed to the view per fetch (None shows all at once)
+        self.rois = list(rois)
+        self._loaded = self._initial_rows()
+    
+    def _initial_rows(self):
+        """Number of rows exposed right after the ROIs are (re)set"""
+        if self.fetch_batch is None:
+            return len(self.rois)
+        return min(self.fetch_batch, len(self.rois))
+    
+    def set_rois(self, rois):
+        """Replace the ROIs shown in the table"""
+        self.beginResetModel()
+        self.rois = list(rois)
+        self._loaded = self._initial_rows()
+        self.endResetModel()
+    
+    def rowCount(self, parent=QModelIndex()):
+        """Number of rows exposed to the view so far (the table has no child rows)"""
+        return 0 if parent.isValid() else self._loaded
+    
+    def canFetchMore(self, parent=QModelIndex()):
+        """Whether ROIs remain that the view has not been given yet"""
+        return not parent.isValid() and self._loaded < len(self.rois)
+    
+    def fetchMore(self, parent=QModelIndex()):
+        """Expose the next batch of rows as the view scrolls towards them"""
+        if parent.isValid():
+            return
+        end = min(self._loaded + (self.fetch_batch or len(self.rois)), len(self.rois))
+        if end <= self._loaded:
+            return
+        self.beginInsertRows(QModelIndex(), self._loaded, end - 1)
+        self._loaded = end
+        self.endInsertRows()
+    
+    def columnCount(self, parent=QModelIndex()):
+        """Number of columns"""
+        return 0 if parent.isValid() else len(self.columns)
+    
+    def data(self, index, role=Qt.DisplayRole):
+        """Format a single cell on demand"""
+        if role != Qt.DisplayRole or not index.isValid():
+            return None
+        return self.columns[index.column()][1](self.rois[index.row()])
+    
+    def headers(self):
+        """Column headers, in order"""
+        return [header for header, _ in self.columns]
+    
+    def iter_rows(self):
+        """Yield every row's formatted cells, straight from the ROIs (including rows not fetched yet)"""
+        formatters = [formatter for _, formatter in self.columns]
+        for roi in self.rois:
+            yield [formatter(roi) for formatter in formatters]
+    
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        """Column headers (row headers keep Qt's 1-based numbering)"""
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.columns[section][0]
+        return super().headerData(section, orientation, role)
+
 class StatisticsPanel(QWidget):
     """UI panel for displaying and exporting ROI statistics"""
     def __init__(self, parent, dicom_model, roi_manager):
         super().__init__(parent)
         self.dicom_model = dicom_model
         self.roi_manager = roi_manager
+        self._detail_dialog = None  # Detailed statistics window, built on first use
+        self._detail_model = None
     
     def setup_ui(self):
         """Set up UI components for statistics"""
         self.layout = QVBoxLayout(self)
         
-        # Statistics table
-        self.stats_table = QTableWidget(0, 5)  # Rows will be added dynamically
-        self.stats_table.setHorizontalHeaderLabels(["Segment", "Mean", "Median", "Min", "Max"])
+        # Statistics table (rows come from the current slice's ROIs)
+        self.stats_model = RoiTableModel(SUMMARY_COLUMNS, parent=self)
+        self.stats_table = QTableView()
+        self.stats_table.setModel(self.stats_model)
         self.stats_table.horizontalHeader().setStretchLastSection(True)
         
         # Set table properties
-        self.stats_table.setEditTriggers(QTableWidget.NoEditTriggers)  # Read-only
+        self.stats_table.setEditTriggers(QAbstractItemView.NoEditTriggers)  # Read-only
         self.stats_table.setAlternatingRowColors(True)
         
         self.layout.addWidget(self.stats_table)
     
     def update_statistics(self):
         """Update the ROI statistics table for current slice"""
-        # Clear the table
-        self.stats_table.setRowCount(0)
-        
         # Get current slice index from the model
         if not self.dicom_model.current_series:
+            self.stats_model.set_rois(())
             return
             
         current_slice = self.dicom_model.current_slice_index
         
-        # Get ROIs for current slice
+        # Get ROIs for current slice; the view formats only the cells it shows
         current_slice_rois = self.roi_manager.get_rois_for_slice(current_slice, self.dicom_model.current_series_path)
-        
-        
-        # Add stats for each ROI
-        for roi in current_slice_rois:            
-            # Add a new row
-            row = self.stats_table.rowCount()
-            self.stats_table.insertRow(row)
-                        
-            # Add data to the row
-            self.stats_table.setItem(row, 0, QTableWidgetItem(roi.segment_label))
-            self.stats_table.setItem(row, 1, QTableWidgetItem(f"{roi.mean_val:.2f}"))
-            self.stats_table.setItem(row, 2, QTableWidgetItem(f"{roi.median_val:.2f}"))
-            self.stats_table.setItem(row, 3, QTableWidgetItem(f"{roi.min_val:.2f}"))
-            self.stats_table.setItem(row, 4, QTableWidgetItem(f"{roi.max_val:.2f}"))
+        self.stats_model.set_rois(current_slice_rois)
     
     def show_detailed_statistics(self):
         """Show a detailed statistics window for all ROIs"""
         if not self.roi_manager.rois:
             return
             
-        # Create a new dialog
+        # Build the window once; later calls only swap in the current ROIs
+        if self._detail_dialog is None:
+            self._detail_dialog = self._build_detail_dialog()
+        
+        self._detail_model.set_rois(self.roi_manager.rois)
+        
+        # Show dialog
+        self._detail_dialog.exec_()
+    
+    def _build_detail_dialog(self):
+        """Create the detailed statistics window and its table model"""
         dialog = QDialog(self)
         dialog.setWindowTitle("ROI Statistics")
         dialog.setMinimumSize(800, 600)
@@ -67,52 +167,17 @@ class StatisticsPanel(QWidget):
         # Create layout
         layout = QVBoxLayout(dialog)
         
-        # Create table
-        table = QTableWidget()
-        table.setColumnCount(20)
-        table.setHorizontalHeaderLabels([
-            "Segment Label", "Segment Index", "Slice Index", "Center X", "Center Y", "Radius", 
-            "Center LR (mm)", "Center AP (mm)", "Center SI (mm)", "Orientation", 
-            "Area (mm2)", "Mean", "Median", "Min", "Max", "Size", 
-            "Study ID", "Exam Number", "Series ID", "Series Path"
-            ])
-
+        # Create table; the model gets a snapshot of the ROIs on each show, hands rows to the
+        # view in batches as it scrolls, and formats cells on demand
+        table = QTableView()
+        self._detail_model = RoiTableModel(DETAIL_COLUMNS, parent=table, fetch_batch=200)
+        table.setModel(self._detail_model)
         
         # Set table properties
-        table.setEditTriggers(QTableWidget.NoEditTriggers)  # Read-only
+        table.setEditTriggers(QAbstractItemView.NoEditTriggers)  # Read-only
         table.setAlternatingRowColors(True)
         table.horizontalHeader().setStretchLastSection(True)
         
-        # Populate table with ROI data
-        for roi in self.roi_manager.rois:
-
-                
-            # Add a new row
-            row = table.rowCount()
-            table.insertRow(row)
-            
-            # Add data to the row
-            table.setItem(row, 0, QTableWidgetItem(roi.segment_label))
-            table.setItem(row, 1, QTableWidgetItem(str(roi.segment)))  
-            table.setItem(row, 2, QTableWidgetItem(str(roi.slice_idx+1)))  
-            table.setItem(row, 3, QTableWidgetItem(f"{roi.center_x:.4f}"))
-            table.setItem(row, 4, QTableWidgetItem(f"{roi.center_y:.4f}"))
-            table.setItem(row, 5, QTableWidgetItem(f"{roi.radius_px:.4f}"))
-            table.setItem(row, 6, QTableWidgetItem(f"{roi.center_LR_mm:.4f}"))
-            table.setItem(row, 7, QTableWidgetItem(f"{roi.center_AP_mm:.4f}"))
-            table.setItem(row, 8, QTableWidgetItem(f"{roi.center_SI_mm:.4f}"))
-            table.setItem(row, 9, QTableWidgetItem(f"{roi.orientation}"))
-            table.setItem(row, 10, QTableWidgetItem(f"{roi.area_mm2:.2f}"))
-            table.setItem(row, 11, QTableWidgetItem(f"{roi.mean_val:.2f}"))
-            table.setItem(row, 12, QTableWidgetItem(f"{roi.median_val:.2f}"))
-            table.setItem(row, 13, QTableWidgetItem(f"{roi.min_val:.2f}"))
-            table.setItem(row, 14, QTableWidgetItem(f"{roi.max_val:.2f}"))
-            table.setItem(row, 15, QTableWidgetItem(str(roi.size_px)))
-            table.setItem(row, 16, QTableWidgetItem(roi.study_id))
-            table.setItem(row, 17, QTableWidgetItem(roi.exam_number))
-            table.setItem(row, 18, QTableWidgetItem(roi.series_id))
-            table.setItem(row, 19, QTableWidgetItem(roi.series_path))
-        
         # Add table to layout
         layout.addWidget(table)
         
@@ -133,8 +198,7 @@ class StatisticsPanel(QWidget):
         button_layout.addWidget(close_button)
         layout.addLayout(button_layout)
         
-        # Show dialog
-        dialog.exec_()
+        return dialog
     
     def export_statistics(self, table):
         """Export statistics table to CSV"""
@@ -151,23 +215,12 @@ class StatisticsPanel(QWidget):
             filename += ".csv"
 
         try:
-            with open(filename, 'w', newline='') as f:
+            # Rows stream from the table's model into a 1 MiB file buffer
+            with open(filename, 'w', newline='', buffering=1 << 20) as f:
                 writer = csv.writer(f)
-                headers = []
-                for col in range(table.columnCount()):
-                    headers.append(table.horizontalHeaderItem(col).text())
-                writer.writerow(headers)
-                
-                # Write data
-                for row in range(table.rowCount()):
-                    row_data = []
-                    for col in range(table.columnCount()):
-                        item = table.item(row, col)
-                        if item:
-                            row_data.append(item.text())
-                        else:
-                            row_data.append("")
-                    writer.writerow(row_data)
+                model = table.model()
+                writer.writerow(model.headers())
+                writer.writerows(model.iter_rows())
                 
             print(f"Statistics exported to {filename}")
             return True
@@ -0,0 +1,54 @@
+"""Synthetic DICOM series written to disk for the tests"""
+import os
+
+import numpy as np
+from pydicom.dataset import Dataset, FileMetaDataset
+from pydicom.uid import ExplicitVRLittleEndian, generate_uid
+
+AXIAL = (1, 0, 0, 0, 1, 0)
+MR_IMAGE_STORAGE = '1.2.840.10008.5.1.4.1.1.4'
+
+
+def write_series(series_dir, num_slices, orientation=AXIAL, origin=(-50.0, -60.0, 0.0), slice_step=5.0,
+                 rows=64, columns=80, pixel_spacing=1.5, bits_stored=16, signed=True, pixel_arrays=None):
+    """Write one uncompressed single-frame file per slice and return the series UID"""
+    os.makedirs(series_dir, exist_ok=True)
+    series_uid = generate_uid()
+    normal = np.cross(orientation[:3], orientation[3:])
+    dtype = np.int16 if signed else np.uint16
+    
+    for i in range(num_slices):
+        meta = FileMetaDataset()
+        meta.TransferSyntaxUID = ExplicitVRLittleEndian
+        meta.MediaStorageSOPClassUID = MR_IMAGE_STORAGE
+        meta.MediaStorageSOPInstanceUID = generate_uid()
+        
+        ds = Dataset()
+        ds.file_meta = meta
+        ds.SOPClassUID = meta.MediaStorageSOPClassUID
+        ds.SOPInstanceUID = meta.MediaStorageSOPInstanceUID
+        ds.PatientID = 'P1'
+        ds.StudyID = '42'
+        ds.SeriesDescription = os.path.basename(series_dir)
+        ds.SeriesInstanceUID = series_uid
+        ds.InstanceNumber = i + 1
+        ds.ImageOrientationPatient = list(orientation)
+        ds.ImagePositionPatient = (np.asarray(origin) + i * slice_step * normal).tolist()
+        ds.PixelSpacing = [pixel_spacing, pixel_spacing]
+        ds.Rows = rows
+        ds.Columns = columns
+        ds.SamplesPerPixel = 1
+        ds.PhotometricInterpretation = 'MONOCHROME2'
+        ds.BitsAllocated = 16
+        ds.BitsStored = bits_stored
+        ds.HighBit = bits_stored - 1
+        ds.PixelRepresentation = 1 if signed else 0
+        
+        if pixel_arrays is not None:
+            pixels = np.asarray(pixel_arrays[i], dtype=dtype)
+        else:
+            pixels = (np.arange(rows * columns).reshape(rows, columns) % 500 + 10 * i).astype(dtype)
+        ds.PixelData = pixels.tobytes()
+        ds.save_as(os.path.join(series_dir, f'IM{i + 1}.dcm'), enforce_file_format=True)
+    
+    return series_uid
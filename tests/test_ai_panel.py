@@ -0,0 +1,65 @@
+import os
+import unittest
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PyQt5.QtCore import QEventLoop, QTimer
+from PyQt5.QtWidgets import QApplication
+
+from ai_panel import AIControlPanel
+
+
+class StubModelManager:
+    """Stands in for AIModelManager: returns fixed ROIs or raises"""
+
+    def __init__(self, error=None):
+        self.error = error
+
+    def predict_rois(self, dicom_series, progress_callback=None):
+        if self.error is not None:
+            raise self.error
+        progress_callback(100)
+        return [(0, 1, 0.5, 0.5, 0.1)]
+
+
+class StubSeriesModel:
+    current_series = ['slice']
+
+
+class InferenceWorkerTest(unittest.TestCase):
+    """Prediction runs on the worker thread and always hands control back to the panel"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+
+    def run_prediction(self, model_manager):
+        """Start a prediction and wait for the worker to report back"""
+        panel = AIControlPanel(None, StubSeriesModel(), None, model_manager)
+        panel.setup_ui()
+        self.addCleanup(panel.stop_inference_thread)
+
+        loop = QEventLoop()
+        panel.inference_worker.finished.connect(loop.quit)
+        panel.inference_worker.error.connect(loop.quit)
+        QTimer.singleShot(5000, loop.quit)
+        panel.on_predict_rois()
+        self.assertFalse(panel.predict_button.isEnabled())
+        loop.exec_()
+        QApplication.processEvents()
+        return panel
+
+    def test_results(self):
+        panel = self.run_prediction(StubModelManager())
+        self.assertTrue(panel.predict_button.isEnabled())
+        self.assertEqual(panel.status_label.text(), "Predicted 1 ROIs")
+
+    def test_failure_is_reported(self):
+        panel = self.run_prediction(StubModelManager(RuntimeError("CUDA out of memory")))
+        self.assertTrue(panel.predict_button.isEnabled())
+        self.assertFalse(panel.progress_bar.isVisible())
+        self.assertEqual(panel.status_label.text(), "Prediction failed: RuntimeError: CUDA out of memory")
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
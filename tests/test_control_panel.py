@@ -0,0 +1,55 @@
+import os
+import unittest
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PyQt5.QtWidgets import QApplication
+
+from control_panel import ControlPanel
+from roi_manager import ROIManager
+
+
+class SegmentButtonsTest(unittest.TestCase):
+    """Segment buttons and their Ctrl+number shortcuts across both schemes"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        self.roi_manager = ROIManager(None)
+        self.panel = ControlPanel(None, None, self.roi_manager, None)
+        self.panel.setup_ui()
+        self.panel.segment_changed.connect(self.roi_manager.set_current_segment)  # As the app wires it
+        self.selected = []
+        self.panel.segment_changed.connect(self.selected.append)
+
+    def checked_segments(self):
+        return [segment for segment, button in self.panel.segment_buttons.items() if button.isChecked()]
+
+    def test_shortcuts_have_a_single_owner(self):
+        keys = [shortcut.key().toString() for shortcut in self.panel.segment_shortcuts]
+        self.assertEqual(keys, [f"Ctrl+{segment}" for segment in range(1, 10)])
+        for buttons in self.panel.scheme_segment_buttons.values():
+            self.assertTrue(all(button.shortcut().isEmpty() for button in buttons.values()))
+
+    def test_button_click_selects_its_segment(self):
+        self.panel.scheme_segment_buttons[9][4].click()
+        self.assertEqual(self.selected[-1], 4)
+        self.assertEqual(self.checked_segments(), [4])
+
+    def test_shortcuts_follow_the_current_scheme(self):
+        self.panel.four_segment_radio.click()
+        self.panel.segment_shortcuts[2].activated.emit()  # Ctrl+3
+        self.assertEqual(self.selected[-1], 3)
+        self.assertEqual(self.checked_segments(), [3])
+        self.assertFalse(self.panel.scheme_segment_buttons[9][3].isChecked())
+
+        # Ctrl+5 has no button in the 4-segment scheme
+        count = len(self.selected)
+        self.panel.segment_shortcuts[4].activated.emit()
+        self.assertEqual(len(self.selected), count)
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
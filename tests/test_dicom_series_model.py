@@ -0,0 +1,71 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+import pydicom
+
+from dicom_series_model import DicomSeriesModel
+from tests.fixtures import write_series
+
+ROWS, COLUMNS = 8, 6
+
+
+class PixelDataTest(unittest.TestCase):
+    """Memory-mapped pixel reads match pydicom's decoder"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.dicom_model = DicomSeriesModel()
+
+    def load_series(self, name, pixel_arrays, **kwargs):
+        """Write and load a series with the given stored pixel values"""
+        series_path = os.path.join(self.temp_dir.name, name)
+        write_series(series_path, len(pixel_arrays), rows=ROWS, columns=COLUMNS,
+                     pixel_arrays=pixel_arrays, **kwargs)
+        self.assertTrue(self.dicom_model.load_series(series_path))
+        return series_path
+
+    def assert_matches_pydicom(self):
+        """Compare every slice of the loaded series with pydicom's pixel_array"""
+        for index, ds in enumerate(self.dicom_model.current_series):
+            expected = pydicom.dcmread(ds.filename).pixel_array
+            actual = self.dicom_model.get_slice_pixel_data(index)
+            self.assertEqual(actual.dtype, expected.dtype)
+            np.testing.assert_array_equal(actual, expected)
+
+    def test_full_width_values_are_mapped(self):
+        stored = np.arange(ROWS * COLUMNS).reshape(ROWS, COLUMNS) * 1000
+        for signed in (True, False):
+            with self.subTest(signed=signed):
+                self.load_series(f'full_{signed}', [stored - 20000 if signed else stored], signed=signed)
+                self.assertIsNotNone(next(iter(self.dicom_model.pixel_data_locations.values())))
+                self.assert_matches_pydicom()
+
+    def test_unsigned_unused_high_bits_are_masked(self):
+        # Bits above BitsStored (e.g. legacy overlay bits) are not part of the pixel value
+        stored = np.full((ROWS, COLUMNS), 0xF123, dtype=np.uint16)
+        stored[0, 0] = 0x0FFF
+        self.load_series('masked', [stored], bits_stored=12, signed=False)
+        self.assertIsNotNone(next(iter(self.dicom_model.pixel_data_locations.values())))
+        self.assert_matches_pydicom()
+        self.assertEqual(self.dicom_model.get_slice_pixel_data(0)[1, 1], 0x123)
+
+    def test_signed_narrow_values_are_decoded(self):
+        # -5 in 12 bits: only the full decoder sign-extends it
+        stored = np.full((ROWS, COLUMNS), 0x0FFB, dtype=np.int16)
+        self.load_series('signed', [stored], bits_stored=12, signed=True)
+        self.assertIsNone(next(iter(self.dicom_model.pixel_data_locations.values())))
+        self.assert_matches_pydicom()
+
+    def test_locations_only_cover_current_series(self):
+        stored = np.zeros((ROWS, COLUMNS), dtype=np.int16)
+        self.load_series('first', [stored, stored])
+        second_path = self.load_series('second', [stored])
+        self.assertEqual(list(self.dicom_model.pixel_data_locations),
+                         [os.path.join(second_path, 'IM1.dcm')])
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
@@ -0,0 +1,126 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from dicom_series_model import DicomSeriesModel
+from roi_manager import ROIManager
+from tests.fixtures import write_series
+
+PIXEL_SPACING = 1.5
+ORIGIN = (-50.0, -60.0, 0.0)
+
+
+class CalculateRoiStatisticsTest(unittest.TestCase):
+    """Statistics of circular ROIs near and beyond the image edges"""
+
+    def setUp(self):
+        self.roi_manager = ROIManager(None)
+        self.pixel_array = np.arange(100, dtype=np.int16).reshape(10, 10)
+
+    def assert_empty(self, stats):
+        """Check for the (nan, nan, nan, nan, 0) result of an ROI with no pixels"""
+        *values, size_px = stats
+        self.assertTrue(np.isnan(values).all())
+        self.assertEqual(size_px, 0)
+
+    def test_disc_inside_image(self):
+        mean_val, median_val, min_val, max_val, size_px = self.roi_manager.calculate_roi_statistics(
+            self.pixel_array, 5, 5, 1.0)
+        self.assertEqual(size_px, 5)
+        self.assertEqual((min_val, max_val), (45, 65))
+        self.assertAlmostEqual(mean_val, 55.0)
+        self.assertAlmostEqual(median_val, 55.0)
+
+    def test_box_outside_image(self):
+        self.assert_empty(self.roi_manager.calculate_roi_statistics(self.pixel_array, -10, -10, 3.5))
+
+    def test_box_overlaps_corner_but_disc_does_not(self):
+        # The bounding box reaches pixel (0, 0), but it is sqrt(18) > 3.5 from the centre
+        self.assert_empty(self.roi_manager.calculate_roi_statistics(self.pixel_array, -3, -3, 3.5))
+
+
+class RoiSeriesTestCase(unittest.TestCase):
+    """Base for tests that draw ROIs on synthetic axial series"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.dicom_model = DicomSeriesModel()
+        self.roi_manager = ROIManager(self.dicom_model)
+        self.roi_manager.segment_labels = ['Segment 1', 'Segment 2', 'Segment 3']
+
+    def write_series(self, name, num_slices, z0=0.0):
+        """Write an axial series starting at z0 (5 mm apart) and return its path"""
+        series_path = os.path.join(self.temp_dir.name, name)
+        write_series(series_path, num_slices, origin=ORIGIN[:2] + (z0,), pixel_spacing=PIXEL_SPACING)
+        return series_path
+
+    def draw_roi(self, segment, slice_idx, center_x, center_y, radius):
+        """Add an ROI on the loaded series the way the image viewer does"""
+        model = self.dicom_model
+        ds = model.get_slice(slice_idx)
+        radius_px = radius * min(ds.Rows, ds.Columns)
+        center_LR, center_AP, center_SI = (np.asarray(ds.ImagePositionPatient, dtype=np.float64) + (
+            PIXEL_SPACING * ds.Columns * center_x, PIXEL_SPACING * ds.Rows * center_y, 0)).tolist()
+        pixel_array = model.get_slice_pixel_data(slice_idx)
+        stats = self.roi_manager.calculate_roi_statistics(
+            pixel_array, int(center_x * ds.Columns), int(center_y * ds.Rows), radius_px)
+        self.roi_manager.add_roi(
+            self.roi_manager.segment_labels[segment - 1], segment, slice_idx, center_x, center_y, radius,
+            center_LR, center_AP, center_SI, 3, np.pi * (radius_px * PIXEL_SPACING) ** 2, *stats,
+            model.current_study_name, model.current_exam_number, model.current_series_name,
+            model.current_series_uid, model.current_series_path)
+
+
+class ExportImportTest(RoiSeriesTestCase):
+    """ROIs written by export_rois come back unchanged through import_rois"""
+
+    def test_round_trip(self):
+        self.assertTrue(self.dicom_model.load_series(self.write_series('Ax', 4)))
+        self.draw_roi(1, 0, 0.5, 0.5, 0.1)
+        self.draw_roi(2, 2, 0.25, 0.75, 0.05)
+        self.draw_roi(3, 2, 0.6, 0.4, 0.08)
+        filename = os.path.join(self.temp_dir.name, 'rois.csv')
+        self.assertTrue(self.roi_manager.export_rois(filename))
+
+        imported = ROIManager(self.dicom_model)
+        imported.segment_labels = self.roi_manager.segment_labels
+        self.assertTrue(imported.import_rois(filename))
+
+        self.assertEqual(list(imported._iter_export_rows()), list(self.roi_manager._iter_export_rows()))
+        self.assertEqual([roi.segment for roi in imported.get_rois_for_slice(2, self.dicom_model.current_series_path)],
+                         [2, 3])
+
+
+class CopyRoisTest(RoiSeriesTestCase):
+    """copy_rois_from_series places ROIs on the nearest target slice by anatomical position"""
+
+    def test_copy_to_nearest_slice(self):
+        source_path = self.write_series('Source', 6)  # z = 0, 5, ..., 25
+        target_path = self.write_series('Target', 4, z0=2.0)  # z = 2, 7, 12, 17
+        self.dicom_model.load_series(source_path)
+        self.draw_roi(1, 3, 0.5, 0.25, 0.1)  # z = 15: 17 is nearer than 12
+        self.draw_roi(2, 5, 0.5, 0.5, 0.1)  # z = 25: 8 mm from 17, beyond max_distance_mm
+        self.dicom_model.load_series(target_path)
+
+        self.assertTrue(self.roi_manager.copy_rois_from_series(source_path, target_path, max_distance_mm=5.0))
+
+        copied = [roi for roi in self.roi_manager.rois if roi.series_path == target_path]
+        self.assertEqual(len(copied), 1)
+        roi = copied[0]
+        self.assertEqual((roi.segment, roi.slice_idx, roi.orientation), (1, 3, 3))
+        self.assertAlmostEqual(roi.center_x, 0.5)
+        self.assertAlmostEqual(roi.center_y, 0.25)
+        self.assertEqual(self.roi_manager.get_rois_for_slice(3, target_path), (roi,))
+
+        # Statistics are measured on the target slice's pixels
+        radius_px = roi.radius_px * min(64, 80)
+        expected = self.roi_manager.calculate_roi_statistics(
+            self.dicom_model.get_slice_pixel_data(3), int(roi.center_x * 80), int(roi.center_y * 64), radius_px)
+        self.assertEqual((roi.mean_val, roi.median_val, roi.min_val, roi.max_val, roi.size_px), expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file